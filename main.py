@@ -17,6 +17,7 @@ from fastapi import FastAPI
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
+from twitter_app.responses import ORJSONResponse
 from twitter_app.routers import (
     follows,
     hashtags,
@@ -35,6 +36,8 @@ app = FastAPI(
     title="Twitter Microblogging API",
     description="A Twitter-like microblogging platform with users, tweets, follows, likes, retweets, timelines, trending hashtags and @mentions.",
     version="1.0.0",
+    # orjson for every response that doesn't pick its own response class
+    default_response_class=ORJSONResponse,
 )
 
 # ── Routers ────────────────────────────────────────────────────────────────────
@@ -7,7 +7,11 @@ All models use Pydantic v2 BaseModel.
 from __future__ import annotations
 
 from typing import List, Optional
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
+
+
+# Maximum tweet / quote content length, in characters.
+MAX_CONTENT_LENGTH = 280
 
 
 # ── User models ────────────────────────────────────────────────────────────────
@@ -64,15 +68,8 @@ class TweetCreate(BaseModel):
     """Request body for POST /tweets."""
 
     user_id: str
-    content: str
-
-    @field_validator("content")
-    @classmethod
-    def content_max_length(cls, v: str) -> str:
-        """Tweet content must not exceed 280 characters."""
-        if len(v) > 280:
-            raise ValueError("content must not exceed 280 characters")
-        return v
+    # Enforced by pydantic-core, without a Python validator call per request
+    content: str = Field(max_length=MAX_CONTENT_LENGTH)
 
 
 class TweetOut(BaseModel):
@@ -109,15 +106,8 @@ class QuoteTweetCreate(BaseModel):
     """Request body for POST /tweets/{tweet_id}/quote."""
 
     user_id: str
-    content: str
-
-    @field_validator("content")
-    @classmethod
-    def content_max_length(cls, v: str) -> str:
-        """Quote content must not exceed 280 characters."""
-        if len(v) > 280:
-            raise ValueError("content must not exceed 280 characters")
-        return v
+    # Enforced by pydantic-core, without a Python validator call per request
+    content: str = Field(max_length=MAX_CONTENT_LENGTH)
 
 
 # ── Follow models ──────────────────────────────────────────────────────────────
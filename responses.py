@@ -0,0 +1,71 @@
+"""
+Response classes for the Twitter Microblogging App.
+
+ORJSONResponse encodes with orjson, which is several times faster than the
+stdlib json encoder behind FastAPI's default JSONResponse. List endpoints
+return it directly with already-built payloads, so FastAPI skips its
+response_model validation sweep over every element.
+
+cached_json_response serves read-heavy feeds from an in-process cache keyed
+by a storage version counter, with ETag / If-None-Match support.
+"""
+
+from __future__ import annotations
+
+import zlib
+from typing import Any, Callable, Optional, Tuple
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+from twitter_app import storage
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+# ── Versioned response cache ───────────────────────────────────────────────────
+
+# Upper bound on cached payloads; the oldest entry is evicted once reached.
+_RESPONSE_CACHE_MAX = 1024
+
+
+def cached_json_response(
+    request: Request,
+    key: Tuple[str, ...],
+    build: Callable[[], Any],
+    version: Optional[int] = None,
+) -> Response:
+    """
+    Serve a JSON payload from the response cache, rebuilding it on a version miss.
+
+    Entries are tagged with version, defaulting to storage.version, which every
+    write bumps, so any mutation invalidates them. Payloads that depend on less
+    pass a narrower counter (e.g. storage.hashtag_version). Each response
+    carries an ETag of the form "<epoch>-<version>-<key_hash>"; a matching
+    If-None-Match short-circuits with 304. The epoch (storage.cache_epoch) is
+    regenerated per process and by reset_storage(), where the counters restart,
+    so an ETag from before either never matches a payload built after it.
+    """
+    if version is None:
+        version = storage.version
+    entry = storage.response_cache.get(key)
+    if entry is None or entry[0] != version:
+        etag = f'"{storage.cache_epoch}-{version}-{zlib.crc32(repr(key).encode()):08x}"'
+        entry = (version, etag, orjson.dumps(build()))
+        cache = storage.response_cache
+        cache.pop(key, None)
+        if len(cache) >= _RESPONSE_CACHE_MAX:
+            del cache[next(iter(cache))]
+        cache[key] = entry
+
+    _, etag, body = entry
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in {tag.strip() for tag in if_none_match.split(",")}:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
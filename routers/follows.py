@@ -16,6 +16,8 @@ from fastapi import APIRouter, HTTPException, Query
 
 from twitter_app import storage
 from twitter_app.models import FollowRequest, UserOut
+from twitter_app.responses import ORJSONResponse
+from twitter_app.routers.users import _build_user_out
 
 router = APIRouter(prefix="/users", tags=["follows"])
 
@@ -30,26 +32,10 @@ def _get_user_or_404(user_id: str) -> dict:
     return user
 
 
-def _build_user_out(user: dict) -> UserOut:
-    """Build a UserOut with computed counts from a stored user dict."""
-    uid = user["id"]
-    tweet_count = sum(1 for t in storage.tweets.values() if t["user_id"] == uid)
-    return UserOut(
-        id=uid,
-        username=user["username"],
-        display_name=user["display_name"],
-        bio=user.get("bio"),
-        followers_count=len(storage.followers.get(uid, set())),
-        following_count=len(storage.following.get(uid, set())),
-        tweet_count=tweet_count,
-        created_at=user["created_at"],
-    )
-
-
 # ── POST /users/{user_id}/follow ───────────────────────────────────────────────
 
 @router.post("/{user_id}/follow", status_code=200)
-def follow_user(user_id: str, body: FollowRequest) -> dict:
+async def follow_user(user_id: str, body: FollowRequest) -> ORJSONResponse:
     """
     Follow another user.
 
@@ -64,10 +50,7 @@ def follow_user(user_id: str, body: FollowRequest) -> dict:
     if user_id == target_id:
         raise HTTPException(status_code=400, detail="Cannot follow yourself")
 
-    # Initialise sets defensively (should already exist from user creation)
-    storage.following.setdefault(user_id, set())
-    storage.followers.setdefault(target_id, set())
-
+    # Both sets are registered by create_user, so index them directly
     if target_id in storage.following[user_id]:
         raise HTTPException(
             status_code=409,
@@ -76,17 +59,20 @@ def follow_user(user_id: str, body: FollowRequest) -> dict:
 
     storage.following[user_id].add(target_id)
     storage.followers[target_id].add(user_id)
+    storage.user_out_cache.pop(user_id, None)
+    storage.user_out_cache.pop(target_id, None)
+    storage.version += 1
 
-    return {"detail": f"Now following '{target_id}'"}
+    return ORJSONResponse({"detail": f"Now following '{target_id}'"})
 
 
 # ── DELETE /users/{user_id}/follow ─────────────────────────────────────────────
 
 @router.delete("/{user_id}/follow", status_code=200)
-def unfollow_user(
+async def unfollow_user(
     user_id: str,
     target_user_id: str = Query(..., description="ID of the user to unfollow"),
-) -> dict:
+) -> ORJSONResponse:
     """
     Unfollow a user.
 
@@ -96,7 +82,7 @@ def unfollow_user(
     _get_user_or_404(user_id)
     _get_user_or_404(target_user_id)
 
-    if target_user_id not in storage.following.get(user_id, set()):
+    if target_user_id not in storage.following[user_id]:
         raise HTTPException(
             status_code=404,
             detail=f"Not following user '{target_user_id}'",
@@ -104,43 +90,56 @@ def unfollow_user(
 
     storage.following[user_id].discard(target_user_id)
     storage.followers[target_user_id].discard(user_id)
+    storage.user_out_cache.pop(user_id, None)
+    storage.user_out_cache.pop(target_user_id, None)
+    storage.version += 1
 
-    return {"detail": f"Unfollowed '{target_user_id}'"}
+    return ORJSONResponse({"detail": f"Unfollowed '{target_user_id}'"})
 
 
 # ── GET /users/{user_id}/followers ─────────────────────────────────────────────
 
-@router.get("/{user_id}/followers", response_model=List[UserOut])
-def get_followers(user_id: str) -> List[UserOut]:
+@router.get(
+    "/{user_id}/followers",
+    response_model=None,
+    responses={200: {"model": List[UserOut]}},
+)
+async def get_followers(user_id: str) -> ORJSONResponse:
     """
     List all users who follow the specified user.
 
     Returns 404 if the user does not exist.
     """
     _get_user_or_404(user_id)
-    follower_ids = storage.followers.get(user_id, set())
+    follower_ids = storage.followers[user_id]
+    users = storage.users
     result = []
     for fid in follower_ids:
-        u = storage.users.get(fid)
+        u = users.get(fid)
         if u:
             result.append(_build_user_out(u))
-    return result
+    return ORJSONResponse(result)
 
 
 # ── GET /users/{user_id}/following ─────────────────────────────────────────────
 
-@router.get("/{user_id}/following", response_model=List[UserOut])
-def get_following(user_id: str) -> List[UserOut]:
+@router.get(
+    "/{user_id}/following",
+    response_model=None,
+    responses={200: {"model": List[UserOut]}},
+)
+async def get_following(user_id: str) -> ORJSONResponse:
     """
     List all users that the specified user follows.
 
     Returns 404 if the user does not exist.
     """
     _get_user_or_404(user_id)
-    following_ids = storage.following.get(user_id, set())
+    following_ids = storage.following[user_id]
+    users = storage.users
     result = []
     for fid in following_ids:
-        u = storage.users.get(fid)
+        u = users.get(fid)
         if u:
             result.append(_build_user_out(u))
-    return result
+    return ORJSONResponse(result)
@@ -3,24 +3,51 @@ Hashtags router — AC30-AC31.
 
 Endpoints:
   GET /hashtags/{tag}/tweets  → 200 List[TweetOut]  newest first, empty list if none.
+                                Cached per storage version; supports ETag (304).
 """
 
 from __future__ import annotations
 
 from typing import List
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
 from twitter_app import storage
 from twitter_app.models import TweetOut
+from twitter_app.responses import cached_json_response
 
 router = APIRouter(prefix="/hashtags", tags=["hashtags"])
 
 
+# ── Helpers ────────────────────────────────────────────────────────────────────
+
+def _build_hashtag_feed(tag_lower: str) -> List[dict]:
+    """Render every live tweet using tag_lower, newest first."""
+    from twitter_app.routers.tweets import _build_tweet_out
+
+    tweet_ids = storage.hashtag_index.get(tag_lower, {})
+
+    # Postings are in creation order, so walk them backwards for newest first.
+    # delete_tweet deindexes its hashtags, so every posted id is still live.
+    tweets = storage.tweets
+    result = [tweets[tid] for tid in reversed(tweet_ids)]
+
+    author_cache: dict = {}
+    out_cache: dict = {}
+    return [
+        _build_tweet_out(t, author_cache=author_cache, out_cache=out_cache)
+        for t in result
+    ]
+
+
 # ── GET /hashtags/{tag}/tweets ─────────────────────────────────────────────────
 
-@router.get("/{tag}/tweets", response_model=List[TweetOut])
-def get_tweets_by_hashtag(tag: str) -> List[TweetOut]:
+@router.get(
+    "/{tag}/tweets",
+    response_model=None,
+    responses={200: {"model": List[TweetOut]}},
+)
+async def get_tweets_by_hashtag(tag: str, request: Request) -> Response:
     """
     Retrieve all tweets containing the given hashtag, newest first.
 
@@ -28,17 +55,7 @@ def get_tweets_by_hashtag(tag: str) -> List[TweetOut]:
     - Matching is case-insensitive.
     - Returns an empty list if no tweets use this hashtag.
     """
-    from twitter_app.routers.tweets import _build_tweet_out
-
     tag_lower = tag.lower()
-    tweet_ids = storage.hashtag_index.get(tag_lower, [])
-
-    # Filter to tweets that still exist (may have been deleted)
-    result = []
-    for tid in tweet_ids:
-        tweet = storage.tweets.get(tid)
-        if tweet:
-            result.append(tweet)
-
-    result.sort(key=lambda t: t["created_at"], reverse=True)
-    return [_build_tweet_out(t) for t in result]
+    return cached_json_response(
+        request, ("hashtag", tag_lower), lambda: _build_hashtag_feed(tag_lower)
+    )
@@ -2,7 +2,7 @@
 Likes router — AC25-AC27.
 
 Endpoints:
-  POST   /tweets/{tweet_id}/like   → 200          (404 tweet, 409 double-like)
+  POST   /tweets/{tweet_id}/like   → 200          (404 tweet/user, 409 double-like)
   DELETE /tweets/{tweet_id}/like   → 200          (404 if not found)
 """
 
@@ -12,14 +12,15 @@ from fastapi import APIRouter, HTTPException, Query
 
 from twitter_app import storage
 from twitter_app.models import LikeRequest
+from twitter_app.responses import ORJSONResponse
 
 router = APIRouter(prefix="/tweets", tags=["likes"])
 
 
 # ── Helper ─────────────────────────────────────────────────────────────────────
 
-def _get_tweet_or_404(tweet_id: str) -> dict:
-    """Return a stored tweet dict or raise 404."""
+def _get_tweet_or_404(tweet_id: str) -> storage.TweetRec:
+    """Return a stored tweet record or raise 404."""
     tweet = storage.tweets.get(tweet_id)
     if not tweet:
         raise HTTPException(status_code=404, detail=f"Tweet '{tweet_id}' not found")
@@ -29,34 +30,45 @@ def _get_tweet_or_404(tweet_id: str) -> dict:
 # ── POST /tweets/{tweet_id}/like ───────────────────────────────────────────────
 
 @router.post("/{tweet_id}/like", status_code=200)
-def like_tweet(tweet_id: str, body: LikeRequest) -> dict:
+async def like_tweet(tweet_id: str, body: LikeRequest) -> ORJSONResponse:
     """
     Like a tweet.
 
-    - Returns 404 if the tweet does not exist.
+    - Returns 404 if the tweet or the user does not exist.
     - Returns 409 if the user has already liked this tweet.
     """
     _get_tweet_or_404(tweet_id)
 
-    likers = storage.likes.setdefault(tweet_id, set())
+    user_idx = storage.user_index.get(body.user_id)
+    if user_idx is None:
+        raise HTTPException(status_code=404, detail=f"User '{body.user_id}' not found")
 
-    if body.user_id in likers:
+    # Every tweet gets its LikerSet at creation, so index rather than setdefault
+    likers = storage.likes[tweet_id]
+
+    if user_idx in likers:
         raise HTTPException(
             status_code=409,
             detail=f"User '{body.user_id}' has already liked tweet '{tweet_id}'",
         )
 
-    likers.add(body.user_id)
-    return {"detail": "Tweet liked", "like_count": len(likers)}
+    likers.add(user_idx)
+    liked = storage.likes_by_user.get(body.user_id)
+    if liked is None:
+        # Created on a user's first like; most users never like anything
+        liked = storage.likes_by_user[body.user_id] = set()
+    liked.add(tweet_id)
+    storage.version += 1
+    return ORJSONResponse({"detail": "Tweet liked", "like_count": len(likers)})
 
 
 # ── DELETE /tweets/{tweet_id}/like ────────────────────────────────────────────
 
 @router.delete("/{tweet_id}/like", status_code=200)
-def unlike_tweet(
+async def unlike_tweet(
     tweet_id: str,
     user_id: str = Query(..., description="ID of the user unliking the tweet"),
-) -> dict:
+) -> ORJSONResponse:
     """
     Unlike a tweet.
 
@@ -65,12 +77,16 @@ def unlike_tweet(
     """
     _get_tweet_or_404(tweet_id)
 
-    likers = storage.likes.get(tweet_id, set())
-    if user_id not in likers:
+    user_idx = storage.user_index.get(user_id)
+    likers = storage.likes[tweet_id]
+    if user_idx is None or user_idx not in likers:
         raise HTTPException(
             status_code=404,
             detail=f"User '{user_id}' has not liked tweet '{tweet_id}'",
         )
 
-    likers.discard(user_id)
-    return {"detail": "Tweet unliked", "like_count": len(likers)}
+    likers.discard(user_idx)
+    # A recorded like implies the user's likes_by_user entry exists
+    storage.likes_by_user[user_id].discard(tweet_id)
+    storage.version += 1
+    return ORJSONResponse({"detail": "Tweet unliked", "like_count": len(likers)})
@@ -13,14 +13,19 @@ from fastapi import APIRouter, HTTPException
 
 from twitter_app import storage
 from twitter_app.models import TweetOut
+from twitter_app.responses import ORJSONResponse
 
 router = APIRouter(prefix="/users", tags=["mentions"])
 
 
 # ── GET /users/{user_id}/mentions ─────────────────────────────────────────────
 
-@router.get("/{user_id}/mentions", response_model=List[TweetOut])
-def get_mentions(user_id: str) -> List[TweetOut]:
+@router.get(
+    "/{user_id}/mentions",
+    response_model=None,
+    responses={200: {"model": List[TweetOut]}},
+)
+async def get_mentions(user_id: str) -> ORJSONResponse:
     """
     List all tweets where the user's @username was mentioned, newest first.
 
@@ -34,11 +39,14 @@ def get_mentions(user_id: str) -> List[TweetOut]:
 
     from twitter_app.routers.tweets import _build_tweet_out
 
-    username_lower = user["username"].lower()
-
-    mentioned_tweets = [
-        t for t in storage.tweets.values()
-        if any(m.lower() == username_lower for m in t.get("mentions", []))
-    ]
-    mentioned_tweets.sort(key=lambda t: t["created_at"], reverse=True)
-    return [_build_tweet_out(t) for t in mentioned_tweets]
+    # The index is in creation order; reversing it yields newest first
+    tweet_ids = storage.mentions_index.get(user["username_lower"], {})
+    # delete_tweet deindexes its mentions, so every posted id is still live
+    tweets = storage.tweets
+    mentioned_tweets = [tweets[tid] for tid in reversed(tweet_ids)]
+    author_cache: dict = {}
+    out_cache: dict = {}
+    return ORJSONResponse([
+        _build_tweet_out(t, author_cache=author_cache, out_cache=out_cache)
+        for t in mentioned_tweets
+    ])
@@ -8,21 +8,26 @@ Endpoints:
 
 from __future__ import annotations
 
-from datetime import datetime
-from uuid import uuid4
+import time
 
 from fastapi import APIRouter, HTTPException
 
 from twitter_app import storage
-from twitter_app.models import QuoteTweetCreate, RetweetCreate, TweetOut
+from twitter_app.models import MAX_CONTENT_LENGTH, QuoteTweetCreate, RetweetCreate, TweetOut
+from twitter_app.responses import ORJSONResponse
 
 router = APIRouter(prefix="/tweets", tags=["retweets"])
 
 
 # ── POST /tweets/{tweet_id}/retweet ───────────────────────────────────────────
 
-@router.post("/{tweet_id}/retweet", status_code=201, response_model=TweetOut)
-def create_retweet(tweet_id: str, body: RetweetCreate) -> TweetOut:
+@router.post(
+    "/{tweet_id}/retweet",
+    status_code=201,
+    response_model=None,
+    responses={201: {"model": TweetOut}},
+)
+async def create_retweet(tweet_id: str, body: RetweetCreate) -> ORJSONResponse:
     """
     Retweet an existing tweet.
 
@@ -41,30 +46,42 @@ def create_retweet(tweet_id: str, body: RetweetCreate) -> TweetOut:
 
     from twitter_app.routers.tweets import _build_tweet_out
 
-    tid = str(uuid4())
-    now = datetime.utcnow().isoformat()
-
-    retweet = {
-        "id": tid,
-        "type": "retweet",
-        "user_id": body.user_id,
-        "content": None,
-        "created_at": now,
-        "hashtags": [],
-        "mentions": [],
-        "original_tweet_id": tweet_id,
-    }
+    tid = storage.new_id()
+    created_ns = time.time_ns()
+    now = storage.now_iso(created_ns)
+
+    retweet = storage.TweetRec(
+        id=tid,
+        type="retweet",
+        user_id=body.user_id,
+        content=None,
+        created_at=now,
+        created_ns=created_ns,
+        hashtags=[],
+        mentions=[],
+        original_tweet_id=tweet_id,
+    )
 
     storage.tweets[tid] = retweet
-    storage.likes[tid] = set()
+    storage.tweets_by_user.setdefault(body.user_id, []).append(tid)
+    storage.likes[tid] = storage.LikerSet()
+    storage.tweet_counts[body.user_id] = storage.tweet_counts.get(body.user_id, 0) + 1
+    storage.user_out_cache.pop(body.user_id, None)
+    storage.retweet_counts[tweet_id] = storage.retweet_counts.get(tweet_id, 0) + 1
+    storage.version += 1
 
-    return _build_tweet_out(retweet)
+    return ORJSONResponse(_build_tweet_out(retweet), status_code=201)
 
 
 # ── POST /tweets/{tweet_id}/quote ─────────────────────────────────────────────
 
-@router.post("/{tweet_id}/quote", status_code=201, response_model=TweetOut)
-def create_quote_tweet(tweet_id: str, body: QuoteTweetCreate) -> TweetOut:
+@router.post(
+    "/{tweet_id}/quote",
+    status_code=201,
+    response_model=None,
+    responses={201: {"model": TweetOut}},
+)
+async def create_quote_tweet(tweet_id: str, body: QuoteTweetCreate) -> ORJSONResponse:
     """
     Quote an existing tweet with additional commentary.
 
@@ -81,34 +98,41 @@ def create_quote_tweet(tweet_id: str, body: QuoteTweetCreate) -> TweetOut:
     if body.user_id not in storage.users:
         raise HTTPException(status_code=404, detail=f"User '{body.user_id}' not found")
 
-    if len(body.content) > 280:
+    if len(body.content) > MAX_CONTENT_LENGTH:
         raise HTTPException(status_code=400, detail="Content must not exceed 280 characters")
 
     from twitter_app.routers.tweets import (
         _build_tweet_out,
-        _extract_hashtags,
-        _extract_mentions,
+        _extract_tokens,
         _index_hashtags,
+        _index_mentions,
     )
 
-    tid = str(uuid4())
-    now = datetime.utcnow().isoformat()
-    hashtags = _extract_hashtags(body.content)
-    mentions = _extract_mentions(body.content)
-
-    quote_tweet = {
-        "id": tid,
-        "type": "quote",
-        "user_id": body.user_id,
-        "content": body.content,
-        "created_at": now,
-        "hashtags": hashtags,
-        "mentions": mentions,
-        "original_tweet_id": tweet_id,
-    }
+    tid = storage.new_id()
+    created_ns = time.time_ns()
+    now = storage.now_iso(created_ns)
+    hashtags, mentions = _extract_tokens(body.content)
+
+    quote_tweet = storage.TweetRec(
+        id=tid,
+        type="quote",
+        user_id=body.user_id,
+        content=body.content,
+        created_at=now,
+        created_ns=created_ns,
+        hashtags=hashtags,
+        mentions=mentions,
+        original_tweet_id=tweet_id,
+    )
 
     storage.tweets[tid] = quote_tweet
-    storage.likes[tid] = set()
+    storage.tweets_by_user.setdefault(body.user_id, []).append(tid)
+    storage.likes[tid] = storage.LikerSet()
+    storage.tweet_counts[body.user_id] = storage.tweet_counts.get(body.user_id, 0) + 1
+    storage.user_out_cache.pop(body.user_id, None)
+    storage.quote_counts[tweet_id] = storage.quote_counts.get(tweet_id, 0) + 1
     _index_hashtags(tid, hashtags)
+    _index_mentions(tid, mentions)
+    storage.version += 1
 
-    return _build_tweet_out(quote_tweet)
+    return ORJSONResponse(_build_tweet_out(quote_tweet), status_code=201)
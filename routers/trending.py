@@ -3,36 +3,48 @@ Trending router — AC32-AC33.
 
 Endpoints:
   GET /trending  → 200 List[TrendingItem]  top 10 hashtags by tweet count, descending.
+                   Cached until hashtag counts change; supports ETag / If-None-Match (304).
 """
 
 from __future__ import annotations
 
+import heapq
+from operator import itemgetter
 from typing import List
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
 from twitter_app import storage
 from twitter_app.models import TrendingItem
+from twitter_app.responses import cached_json_response
 
 router = APIRouter(tags=["trending"])
 
 
+# ── Helpers ────────────────────────────────────────────────────────────────────
+
+def _build_trending() -> List[dict]:
+    """Rank the top 10 hashtags as TrendingItem-shaped dicts."""
+    # hashtag_counts is maintained on create/delete, so it only holds live tags
+    ranked = heapq.nlargest(10, storage.hashtag_counts.items(), key=itemgetter(1))
+    return [{"hashtag": tag, "count": cnt} for tag, cnt in ranked]
+
+
 # ── GET /trending ──────────────────────────────────────────────────────────────
 
-@router.get("/trending", response_model=List[TrendingItem])
-def get_trending() -> List[TrendingItem]:
+@router.get(
+    "/trending",
+    response_model=None,
+    responses={200: {"model": List[TrendingItem]}},
+)
+async def get_trending(request: Request) -> Response:
     """
     Return the top 10 trending hashtags ranked by number of tweets that use them.
 
     Only counts tweets that currently exist in storage (deleted tweets excluded).
     Returns an empty list if no hashtags have been used.
     """
-    # Compute live counts (respects deleted tweets)
-    counts: dict[str, int] = {}
-    for tag, tweet_ids in storage.hashtag_index.items():
-        live_count = sum(1 for tid in tweet_ids if tid in storage.tweets)
-        if live_count > 0:
-            counts[tag] = live_count
-
-    ranked = sorted(counts.items(), key=lambda x: x[1], reverse=True)[:10]
-    return [TrendingItem(hashtag=tag, count=cnt) for tag, cnt in ranked]
+    # Only hashtag writes can change the ranking, so key on hashtag_version
+    return cached_json_response(
+        request, ("trending",), _build_trending, version=storage.hashtag_version
+    )
@@ -10,128 +10,234 @@ Endpoints:
 from __future__ import annotations
 
 import re
-from datetime import datetime
-from typing import List, Optional
-from uuid import uuid4
+import sys
+import time
+from typing import Dict, List, Optional, Set, Tuple
 
 from fastapi import APIRouter, HTTPException, Response
 
 from twitter_app import storage
-from twitter_app.models import TweetCreate, TweetOut, UserOut
+from twitter_app.models import MAX_CONTENT_LENGTH, TweetCreate, TweetOut
+from twitter_app.responses import ORJSONResponse
+from twitter_app.routers.users import _build_user_out
 
 router = APIRouter(prefix="/tweets", tags=["tweets"])
 
-# Regex patterns for hashtag and mention extraction
-_HASHTAG_RE = re.compile(r"#(\w+)")
-_MENTION_RE = re.compile(r"@(\w+)")
+# Single regex for both #hashtags and @mentions — one pass over the content
+_TOKEN_RE = re.compile(r"([#@])(\w+)")
 
 
 # ── Helpers ────────────────────────────────────────────────────────────────────
 
-def _extract_hashtags(content: str) -> List[str]:
-    """Return a deduplicated list of lowercase hashtags found in content."""
-    return list(dict.fromkeys(
-        tag.lower() for tag in _HASHTAG_RE.findall(content)
-    ))
-
+def _extract_tokens(content: str) -> Tuple[List[str], List[str]]:
+    """
+    Return (hashtags, mentions) found in content, each deduplicated in order.
 
-def _extract_mentions(content: str) -> List[str]:
-    """Return a deduplicated list of @mention usernames found in content."""
-    return list(dict.fromkeys(_MENTION_RE.findall(content)))
+    Both are lowercased at write time so reads never re-normalise them, and
+    interned, so every tweet, index key (and, for mentions, the user's
+    username_lower) using the same token shares one string object.
+    """
+    hashtags: List[str] = []
+    mentions: List[str] = []
+    # Most tweets carry no tokens; `in` is a C-level scan, far cheaper than
+    # entering the regex engine for nothing.
+    if "#" not in content and "@" not in content:
+        return hashtags, mentions
+    seen_hashtags: Set[str] = set()
+    seen_mentions: Set[str] = set()
+    for match in _TOKEN_RE.finditer(content):
+        sigil, word = match.groups()
+        if sigil == "#":
+            word = sys.intern(word.lower())
+            if word not in seen_hashtags:
+                seen_hashtags.add(word)
+                hashtags.append(word)
+        else:
+            word = sys.intern(word.lower())
+            if word not in seen_mentions:
+                seen_mentions.add(word)
+                mentions.append(word)
+    return hashtags, mentions
 
 
 def _index_hashtags(tweet_id: str, hashtags: List[str]) -> None:
-    """Add tweet_id to the hashtag index for each hashtag."""
+    """Add tweet_id to the hashtag index and bump each hashtag's live count."""
+    if not hashtags:
+        return
+    index = storage.hashtag_index
     for tag in hashtags:
-        storage.hashtag_index.setdefault(tag, []).append(tweet_id)
+        postings = index.get(tag)
+        if postings is None:
+            postings = index[tag] = {}
+        postings[tweet_id] = None
+        storage.hashtag_counts[tag] = storage.hashtag_counts.get(tag, 0) + 1
+    storage.hashtag_version += 1
 
 
 def _deindex_hashtags(tweet_id: str, hashtags: List[str]) -> None:
     """Remove tweet_id from the hashtag index (used on tweet deletion)."""
     for tag in hashtags:
-        lst = storage.hashtag_index.get(tag, [])
-        if tweet_id in lst:
-            lst.remove(tweet_id)
-
-
-def _get_tweet_or_404(tweet_id: str) -> dict:
-    """Return a stored tweet dict or raise 404."""
+        postings = storage.hashtag_index.get(tag)
+        if postings and tweet_id in postings:
+            del postings[tweet_id]
+            storage.hashtag_version += 1
+            # Drop the tag from the index and live counts once its last tweet
+            # is gone, so neither grows with tags nobody uses any more
+            remaining = storage.hashtag_counts[tag] - 1
+            if remaining:
+                storage.hashtag_counts[tag] = remaining
+            else:
+                del storage.hashtag_counts[tag]
+                del storage.hashtag_index[tag]
+
+
+def _index_mentions(tweet_id: str, mentions: List[str]) -> None:
+    """Add tweet_id to the mentions index (mentions are already lowercase)."""
+    index = storage.mentions_index
+    for name in mentions:
+        postings = index.get(name)
+        if postings is None:
+            postings = index[name] = {}
+        postings[tweet_id] = None
+
+
+def _deindex_mentions(tweet_id: str, mentions: List[str]) -> None:
+    """Remove tweet_id from the mentions index (used on tweet deletion)."""
+    index = storage.mentions_index
+    for name in mentions:
+        postings = index.get(name)
+        if postings is not None:
+            postings.pop(tweet_id, None)
+            if not postings:
+                del index[name]
+
+
+def _get_tweet_or_404(tweet_id: str) -> storage.TweetRec:
+    """Return a stored tweet record or raise 404."""
     tweet = storage.tweets.get(tweet_id)
     if not tweet:
         raise HTTPException(status_code=404, detail=f"Tweet '{tweet_id}' not found")
     return tweet
 
 
-def _build_user_out(user: dict) -> UserOut:
-    """Build a UserOut from a stored user dict."""
-    uid = user["id"]
-    tweet_count = sum(1 for t in storage.tweets.values() if t["user_id"] == uid)
-    return UserOut(
-        id=uid,
-        username=user["username"],
-        display_name=user["display_name"],
-        bio=user.get("bio"),
-        followers_count=len(storage.followers.get(uid, set())),
-        following_count=len(storage.following.get(uid, set())),
-        tweet_count=tweet_count,
-        created_at=user["created_at"],
-    )
-
-
 def _count_retweets(tweet_id: str) -> int:
-    """Count tweets of type 'retweet' that reference tweet_id."""
-    return sum(
-        1 for t in storage.tweets.values()
-        if t.get("type") == "retweet" and t.get("original_tweet_id") == tweet_id
-    )
+    """Return the number of retweets that reference tweet_id."""
+    return storage.retweet_counts.get(tweet_id, 0)
 
 
 def _count_quotes(tweet_id: str) -> int:
-    """Count tweets of type 'quote' that reference tweet_id."""
-    return sum(
-        1 for t in storage.tweets.values()
-        if t.get("type") == "quote" and t.get("original_tweet_id") == tweet_id
-    )
+    """Return the number of quote tweets that reference tweet_id."""
+    return storage.quote_counts.get(tweet_id, 0)
 
 
-def _build_tweet_out(tweet: dict, depth: int = 0) -> TweetOut:
+def _get_author_out(
+    user_id: str, author_cache: Optional[Dict[str, Optional[dict]]] = None
+) -> Optional[dict]:
     """
-    Build a TweetOut from a stored tweet dict.
+    Return the UserOut dict for a tweet author, memoised in author_cache if given.
 
-    depth prevents infinite recursion when building nested original_tweet.
+    List endpoints share one cache per response so each distinct author is
+    built once, however many of their tweets (or quoted tweets) appear.
     """
-    tid = tweet["id"]
-    author_dict = storage.users.get(tweet["user_id"])
+    if author_cache is not None and user_id in author_cache:
+        return author_cache[user_id]
+    author_dict = storage.users.get(user_id)
     author = _build_user_out(author_dict) if author_dict else None
+    if author_cache is not None:
+        author_cache[user_id] = author
+    return author
+
 
-    original_tweet_out: Optional[TweetOut] = None
-    orig_id = tweet.get("original_tweet_id")
+def _build_tweet_out(
+    tweet: storage.TweetRec,
+    depth: int = 0,
+    author_cache: Optional[Dict[str, Optional[dict]]] = None,
+    out_cache: Optional[Dict[str, dict]] = None,
+) -> dict:
+    """
+    Build a TweetOut-shaped dict from a stored tweet record.
+
+    The record is trusted storage data, so no Pydantic model is built; the
+    dict is serialised directly by orjson.
+    depth prevents infinite recursion when building nested original_tweet.
+    author_cache is an optional per-response user_id → author dict memo.
+    out_cache is an optional per-response tweet_id → nested tweet dict memo, so
+    a tweet retweeted/quoted many times in one feed is rendered only once.
+    """
+    tid = tweet.id
+    author = _get_author_out(tweet.user_id, author_cache)
+
+    original_tweet_out: Optional[dict] = None
+    orig_id = tweet.original_tweet_id
     if orig_id and depth == 0:
-        orig = storage.tweets.get(orig_id)
-        if orig:
-            original_tweet_out = _build_tweet_out(orig, depth=1)
+        if out_cache is not None and orig_id in out_cache:
+            original_tweet_out = out_cache[orig_id]
+        else:
+            orig = storage.tweets.get(orig_id)
+            if orig:
+                original_tweet_out = _build_tweet_out(orig, depth=1, author_cache=author_cache)
+                if out_cache is not None:
+                    out_cache[orig_id] = original_tweet_out
+
+    return {
+        "id": tid,
+        "type": tweet.type,
+        "user_id": tweet.user_id,
+        "content": tweet.content,
+        "created_at": tweet.created_at,
+        "hashtags": tweet.hashtags,
+        "mentions": tweet.mentions,
+        "like_count": len(storage.likes.get(tid, ())),
+        "retweet_count": _count_retweets(tid),
+        "quote_count": _count_quotes(tid),
+        "original_tweet_id": orig_id,
+        "original_tweet": original_tweet_out,
+        "author": author,
+    }
 
-    return TweetOut(
+
+def _publish_tweet(user_id: str, content: str) -> storage.TweetRec:
+    """
+    Store a new original tweet in every index and counter and return it.
+
+    The caller validates the user and content length. Also used by the test
+    factories to seed tweets without an HTTP round trip.
+    """
+    tid = storage.new_id()
+    created_ns = time.time_ns()
+    hashtags, mentions = _extract_tokens(content)
+
+    tweet = storage.TweetRec(
         id=tid,
-        type=tweet.get("type", "tweet"),
-        user_id=tweet["user_id"],
-        content=tweet.get("content"),
-        created_at=tweet["created_at"],
-        hashtags=tweet.get("hashtags", []),
-        mentions=tweet.get("mentions", []),
-        like_count=len(storage.likes.get(tid, set())),
-        retweet_count=_count_retweets(tid),
-        quote_count=_count_quotes(tid),
-        original_tweet_id=orig_id,
-        original_tweet=original_tweet_out,
-        author=author,
+        type="tweet",
+        user_id=user_id,
+        content=content,
+        created_at=storage.now_iso(created_ns),
+        created_ns=created_ns,
+        hashtags=hashtags,
+        mentions=mentions,
     )
 
+    storage.tweets[tid] = tweet
+    storage.tweets_by_user.setdefault(user_id, []).append(tid)
+    storage.likes[tid] = storage.LikerSet()
+    storage.tweet_counts[user_id] = storage.tweet_counts.get(user_id, 0) + 1
+    storage.user_out_cache.pop(user_id, None)
+    _index_hashtags(tid, hashtags)
+    _index_mentions(tid, mentions)
+    storage.version += 1
+    return tweet
+
 
 # ── POST /tweets ───────────────────────────────────────────────────────────────
 
-@router.post("", status_code=201, response_model=TweetOut)
-def create_tweet(body: TweetCreate) -> TweetOut:
+@router.post(
+    "",
+    status_code=201,
+    response_model=None,
+    responses={201: {"model": TweetOut}},
+)
+async def create_tweet(body: TweetCreate) -> ORJSONResponse:
     """
     Create a new original tweet.
 
@@ -143,36 +249,21 @@ def create_tweet(body: TweetCreate) -> TweetOut:
         raise HTTPException(status_code=404, detail=f"User '{body.user_id}' not found")
 
     # Length guard (also enforced by Pydantic but kept for clarity)
-    if len(body.content) > 280:
+    if len(body.content) > MAX_CONTENT_LENGTH:
         raise HTTPException(status_code=400, detail="Content must not exceed 280 characters")
 
-    tid = str(uuid4())
-    now = datetime.utcnow().isoformat()
-    hashtags = _extract_hashtags(body.content)
-    mentions = _extract_mentions(body.content)
-
-    tweet = {
-        "id": tid,
-        "type": "tweet",
-        "user_id": body.user_id,
-        "content": body.content,
-        "created_at": now,
-        "hashtags": hashtags,
-        "mentions": mentions,
-        "original_tweet_id": None,
-    }
-
-    storage.tweets[tid] = tweet
-    storage.likes[tid] = set()
-    _index_hashtags(tid, hashtags)
-
-    return _build_tweet_out(tweet)
+    tweet = _publish_tweet(body.user_id, body.content)
+    return ORJSONResponse(_build_tweet_out(tweet), status_code=201)
 
 
 # ── GET /tweets/{tweet_id} ─────────────────────────────────────────────────────
 
-@router.get("/{tweet_id}", response_model=TweetOut)
-def get_tweet(tweet_id: str) -> TweetOut:
+@router.get(
+    "/{tweet_id}",
+    response_model=None,
+    responses={200: {"model": TweetOut}},
+)
+async def get_tweet(tweet_id: str) -> ORJSONResponse:
     """
     Retrieve a tweet by ID.
 
@@ -180,27 +271,46 @@ def get_tweet(tweet_id: str) -> TweetOut:
     Returns 404 if the tweet does not exist.
     """
     tweet = _get_tweet_or_404(tweet_id)
-    return _build_tweet_out(tweet)
+    return ORJSONResponse(_build_tweet_out(tweet))
 
 
 # ── DELETE /tweets/{tweet_id} ──────────────────────────────────────────────────
 
 @router.delete("/{tweet_id}", status_code=204)
-def delete_tweet(tweet_id: str) -> Response:
+async def delete_tweet(tweet_id: str) -> Response:
     """
     Delete a tweet by ID.
 
     Returns 204 No Content on success. Returns 404 if not found.
-    Cleans up the hashtag index and like store.
+    Cleans up the hashtag/mention indexes, like store and all denormalised counters.
     """
     tweet = _get_tweet_or_404(tweet_id)
 
-    # Clean up hashtag index
-    _deindex_hashtags(tweet_id, tweet.get("hashtags", []))
-
-    # Remove likes store for this tweet
-    storage.likes.pop(tweet_id, None)
-
+    # Clean up hashtag and mention indexes
+    _deindex_hashtags(tweet_id, tweet.hashtags)
+    _deindex_mentions(tweet_id, tweet.mentions)
+
+    # Remove likes store for this tweet, and the tweet from each liker's index
+    likes_by_user = storage.likes_by_user
+    user_ids = storage.user_ids
+    for liker_idx in storage.likes.pop(tweet_id, ()):
+        likes_by_user[user_ids[liker_idx]].discard(tweet_id)
+
+    # Keep the author's denormalised tweet_count in sync
+    storage.tweet_counts[tweet.user_id] -= 1
+    storage.user_out_cache.pop(tweet.user_id, None)
+
+    # Release this tweet's own counters and decrement the original's counter
+    storage.retweet_counts.pop(tweet_id, None)
+    storage.quote_counts.pop(tweet_id, None)
+    orig_id = tweet.original_tweet_id
+    if orig_id:
+        counts = storage.retweet_counts if tweet.type == "retweet" else storage.quote_counts
+        if orig_id in counts:
+            counts[orig_id] -= 1
+
+    storage.tweets_by_user[tweet.user_id].remove(tweet_id)
     del storage.tweets[tweet_id]
+    storage.version += 1
 
     return Response(status_code=204)
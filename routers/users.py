@@ -10,35 +10,60 @@ Endpoints:
 
 from __future__ import annotations
 
-from datetime import datetime
-from uuid import uuid4
+import sys
+from typing import Callable, List, Optional
 
 from fastapi import APIRouter, HTTPException
 
 from twitter_app import storage
-from twitter_app.models import UserCreate, UserOut, UserUpdate
+from twitter_app.models import TweetOut, UserCreate, UserOut, UserUpdate
+from twitter_app.responses import ORJSONResponse
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+# tweets imports this module at load time, so its builder is resolved lazily
+_build_tweet_out: Optional[Callable[..., dict]] = None
+
 
 # ── Helpers ────────────────────────────────────────────────────────────────────
 
-def _build_user_out(user: dict) -> UserOut:
-    """Construct a UserOut from a stored user dict with computed counts."""
+def _build_user_out(user: dict) -> dict:
+    """
+    Build a UserOut-shaped dict from a stored user dict with computed counts.
+
+    Shared by the users, follows and tweets routers. Every count is read
+    from a maintained store (tweet_counts, followers, following), so the
+    cost is O(1) regardless of how many tweets exist. Stored fields were
+    validated on the way in, so no Pydantic model is built: the dict goes
+    straight to orjson. The result is memoised in storage.user_out_cache until
+    a write touching this user pops it.
+    """
     uid = user["id"]
-    tweet_count = sum(
-        1 for t in storage.tweets.values() if t["user_id"] == uid
-    )
-    return UserOut(
-        id=uid,
-        username=user["username"],
-        display_name=user["display_name"],
-        bio=user.get("bio"),
-        followers_count=len(storage.followers.get(uid, set())),
-        following_count=len(storage.following.get(uid, set())),
-        tweet_count=tweet_count,
-        created_at=user["created_at"],
-    )
+    cached = storage.user_out_cache.get(uid)
+    if cached is not None:
+        return cached
+    out = storage.user_out_cache[uid] = {
+        "id": uid,
+        "username": user["username"],
+        "display_name": user["display_name"],
+        "bio": user.get("bio"),
+        # create_user registers both sets, so index directly: no default set
+        # is allocated per call and len() on a set is already O(1)
+        "followers_count": len(storage.followers[uid]),
+        "following_count": len(storage.following[uid]),
+        "tweet_count": storage.tweet_counts.get(uid, 0),
+        "created_at": user["created_at"],
+    }
+    return out
+
+
+def _get_tweet_builder() -> Callable[..., dict]:
+    """Return tweets._build_tweet_out, importing it on first use only."""
+    global _build_tweet_out
+    if _build_tweet_out is None:
+        from twitter_app.routers.tweets import _build_tweet_out as builder
+        _build_tweet_out = builder
+    return _build_tweet_out
 
 
 def _get_user_or_404(user_id: str) -> dict:
@@ -49,60 +74,91 @@ def _get_user_or_404(user_id: str) -> dict:
     return user
 
 
-# ── POST /users ────────────────────────────────────────────────────────────────
-
-@router.post("", status_code=201, response_model=UserOut)
-def create_user(body: UserCreate) -> UserOut:
+def _register_user(username: str, display_name: str, bio: Optional[str] = None) -> dict:
     """
-    Register a new user.
+    Store a new user in every user-keyed index and return the user dict.
 
-    - **username** must be unique (case-insensitive). Returns 409 if taken.
-    - **display_name** is required.
-    - **bio** is optional.
+    Raises 409 if the username is taken (case-insensitive). Also used by the
+    test factories to seed users without an HTTP round trip.
     """
-    normalized = body.username.lower()
+    normalized = username.lower()
     if normalized in storage.usernames:
         raise HTTPException(
             status_code=409,
-            detail=f"Username '{body.username}' is already taken",
+            detail=f"Username '{username}' is already taken",
         )
+    # Interned only once the user is stored (interned strings are immortal on
+    # 3.12+): the usernames key, the stored username_lower and every
+    # mentions_index key for this user are then one object
+    normalized = sys.intern(normalized)
 
-    uid = str(uuid4())
-    now = datetime.utcnow().isoformat()
-
+    uid = storage.new_id()
     user = {
         "id": uid,
-        "username": body.username,
-        "display_name": body.display_name,
-        "bio": body.bio,
-        "created_at": now,
+        "username": username,
+        "username_lower": normalized,
+        "display_name": display_name,
+        "bio": bio,
+        "created_at": storage.now_iso(),
     }
 
     storage.users[uid] = user
     storage.usernames[normalized] = uid
+    storage.user_index[uid] = len(storage.user_ids)
+    storage.user_ids.append(uid)
     storage.followers[uid] = set()
     storage.following[uid] = set()
+    storage.tweet_counts[uid] = 0
+    storage.tweets_by_user[uid] = []
+    storage.version += 1
+    return user
 
-    return _build_user_out(user)
+
+# ── POST /users ────────────────────────────────────────────────────────────────
+
+@router.post(
+    "",
+    status_code=201,
+    response_model=None,
+    responses={201: {"model": UserOut}},
+)
+async def create_user(body: UserCreate) -> ORJSONResponse:
+    """
+    Register a new user.
+
+    - **username** must be unique (case-insensitive). Returns 409 if taken.
+    - **display_name** is required.
+    - **bio** is optional.
+    """
+    user = _register_user(body.username, body.display_name, body.bio)
+    return ORJSONResponse(_build_user_out(user), status_code=201)
 
 
 # ── GET /users/{user_id} ───────────────────────────────────────────────────────
 
-@router.get("/{user_id}", response_model=UserOut)
-def get_user(user_id: str) -> UserOut:
+@router.get(
+    "/{user_id}",
+    response_model=None,
+    responses={200: {"model": UserOut}},
+)
+async def get_user(user_id: str) -> ORJSONResponse:
     """
     Retrieve a user by ID.
 
     Returns 404 if the user does not exist.
     """
     user = _get_user_or_404(user_id)
-    return _build_user_out(user)
+    return ORJSONResponse(_build_user_out(user))
 
 
 # ── PUT /users/{user_id} ───────────────────────────────────────────────────────
 
-@router.put("/{user_id}", response_model=UserOut)
-def update_user(user_id: str, body: UserUpdate) -> UserOut:
+@router.put(
+    "/{user_id}",
+    response_model=None,
+    responses={200: {"model": UserOut}},
+)
+async def update_user(user_id: str, body: UserUpdate) -> ORJSONResponse:
     """
     Update a user's display_name and/or bio.
 
@@ -114,14 +170,20 @@ def update_user(user_id: str, body: UserUpdate) -> UserOut:
         user["display_name"] = body.display_name
     if body.bio is not None:
         user["bio"] = body.bio
+    storage.user_out_cache.pop(user_id, None)
+    storage.version += 1
 
-    return _build_user_out(user)
+    return ORJSONResponse(_build_user_out(user))
 
 
 # ── GET /users/{user_id}/tweets ────────────────────────────────────────────────
 
-@router.get("/{user_id}/tweets")
-def get_user_tweets(user_id: str) -> list:
+@router.get(
+    "/{user_id}/tweets",
+    response_model=None,
+    responses={200: {"model": List[TweetOut]}},
+)
+async def get_user_tweets(user_id: str) -> ORJSONResponse:
     """
     List all tweets (originals, retweets, and quote tweets) by a user,
     newest first.
@@ -130,11 +192,12 @@ def get_user_tweets(user_id: str) -> list:
     """
     _get_user_or_404(user_id)
 
-    # Import here to avoid circular import at module load time
-    from twitter_app.routers.tweets import _build_tweet_out
-
-    user_tweets = [
-        t for t in storage.tweets.values() if t["user_id"] == user_id
-    ]
-    user_tweets.sort(key=lambda t: t["created_at"], reverse=True)
-    return [_build_tweet_out(t) for t in user_tweets]
+    build_tweet_out = _get_tweet_builder()
+    # tweets_by_user is kept in creation order, so reversing it is newest-first
+    tweets = storage.tweets
+    author_cache: dict = {}
+    out_cache: dict = {}
+    return ORJSONResponse([
+        build_tweet_out(tweets[tid], author_cache=author_cache, out_cache=out_cache)
+        for tid in reversed(storage.tweets_by_user.get(user_id, ()))
+    ])
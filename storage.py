@@ -6,38 +6,283 @@ All stores are module-level dicts/sets. Call reset_storage() between tests.
 Storage layout:
   users         : Dict[user_id, user_dict]
   usernames     : Dict[username_lower, user_id]   — uniqueness + mention lookups
-  tweets        : Dict[tweet_id, tweet_dict]       — type: 'tweet'|'retweet'|'quote'
+  tweets        : Dict[tweet_id, TweetRec]         — type: 'tweet'|'retweet'|'quote'
+  tweets_by_user: Dict[user_id, List[tweet_id]]    — author index, oldest first
   followers     : Dict[user_id, Set[user_id]]      — who follows THIS user
   following     : Dict[user_id, Set[user_id]]      — who THIS user follows
-  likes         : Dict[tweet_id, Set[user_id]]     — users who liked this tweet
-  hashtag_index : Dict[hashtag_lower, List[tweet_id]]
+  user_index    : Dict[user_id, int]               — dense int per user (bit position)
+  user_ids      : List[user_id]                    — dense int → user_id
+  likes         : Dict[tweet_id, LikerSet]         — user indexes who liked this tweet
+  likes_by_user : Dict[user_id, Set[tweet_id]]     — tweets this user liked
+  hashtag_index : Dict[hashtag_lower, Dict[tweet_id, None]]  — ordered set, oldest first
+  mentions_index: Dict[username_lower, Dict[tweet_id, None]] — ordered set, oldest first
+  tweet_counts  : Dict[user_id, int]               — tweets authored (incl. retweets/quotes)
+  retweet_counts: Dict[tweet_id, int]              — retweets referencing this tweet
+  quote_counts  : Dict[tweet_id, int]              — quote tweets referencing this tweet
+  hashtag_counts: Dict[hashtag_lower, int]         — live tweets per hashtag (no zeros)
+  version       : int                              — bumped by every write
+  hashtag_version: int                             — bumped when hashtag_counts changes
+  cache_epoch   : str                              — random ETag prefix, new per process/reset
+  response_cache: Dict[key, (version, etag, body)] — see responses.cached_json_response
+  user_out_cache: Dict[user_id, dict]              — rendered UserOut; popped on user writes
 """
 
-from typing import Dict, List, Set
+import itertools
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+
+# ── Records ────────────────────────────────────────────────────────────────────
+
+@dataclass(slots=True)
+class TweetRec:
+    """
+    Stored tweet record (original, retweet or quote).
+
+    Slotted: no per-instance __dict__, and field reads are fixed-offset slot
+    loads rather than hashed dict lookups on every feed render.
+    """
+
+    id: str
+    type: str                               # 'tweet' | 'retweet' | 'quote'
+    user_id: str
+    content: Optional[str]
+    created_at: str
+    created_ns: int                         # same instant as created_at; sort key
+    hashtags: List[str]
+    mentions: List[str]
+    original_tweet_id: Optional[str] = None
+
+
+class Bitset:
+    """
+    Set of small non-negative ints packed one bit each into a bytearray.
+
+    Membership is a bit test. The buffer is sized by the highest index set,
+    not by the number of members, so it only pays off for dense sets; see
+    LikerSet. len() reads a counter kept by add/discard, so it stays O(1)
+    however large the buffer grows.
+    """
+
+    __slots__ = ("_buf", "_count")
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._count = 0
+
+    def __contains__(self, idx: int) -> bool:
+        byte = idx >> 3
+        return byte < len(self._buf) and bool(self._buf[byte] & (1 << (idx & 7)))
+
+    def add(self, idx: int) -> None:
+        byte = idx >> 3
+        if byte >= len(self._buf):
+            self._buf.extend(bytes(byte + 1 - len(self._buf)))
+        mask = 1 << (idx & 7)
+        if not self._buf[byte] & mask:
+            self._buf[byte] |= mask
+            self._count += 1
+
+    def discard(self, idx: int) -> None:
+        byte = idx >> 3
+        mask = 1 << (idx & 7)
+        if byte < len(self._buf) and self._buf[byte] & mask:
+            self._buf[byte] &= ~mask & 0xFF
+            self._count -= 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[int]:
+        for byte, bits in enumerate(self._buf):
+            while bits:
+                low = bits & -bits
+                yield (byte << 3) + low.bit_length() - 1
+                bits ^= low
+
+
+# Conservative per-member cost of a set of ints (a real set slot is 16+ bytes)
+_SET_BYTES_PER_MEMBER = 8
+# Below this many likers a set is always kept: it is small whatever the indexes
+_MIN_PACKED_MEMBERS = 32
+
+
+class LikerSet:
+    """
+    Per-tweet liker user indexes: a plain set while sparse, a Bitset once denser.
+
+    Every user gets a dense index, but a typical tweet's likers are a few
+    arbitrary users spread over the whole range, where a Bitset would cost
+    max_index/8 bytes for a handful of members. add() packs the members into
+    a Bitset only once it is smaller than the set, and unpacks them again if
+    a new high index would make the Bitset (with 2x slack) the larger one.
+    """
+
+    __slots__ = ("_members", "_max")
+
+    def __init__(self) -> None:
+        self._members: Union[Set[int], Bitset] = set()
+        self._max = -1
+
+    def __contains__(self, idx: int) -> bool:
+        return idx in self._members
+
+    def add(self, idx: int) -> None:
+        if idx > self._max:
+            self._max = idx
+        members = self._members
+        packed_bytes = (self._max >> 3) + 1
+        if type(members) is set:
+            members.add(idx)
+            count = len(members)
+            if count >= _MIN_PACKED_MEMBERS and count * _SET_BYTES_PER_MEMBER > packed_bytes:
+                packed = Bitset()
+                packed.add(self._max)           # sizes the buffer once
+                for member in members:
+                    packed.add(member)
+                self._members = packed
+        elif packed_bytes > 2 * (len(members) + 1) * _SET_BYTES_PER_MEMBER:
+            # Checked before Bitset.add, which would grow the buffer to idx
+            unpacked = set(members)
+            unpacked.add(idx)
+            self._members = unpacked
+        else:
+            members.add(idx)
+
+    def discard(self, idx: int) -> None:
+        self._members.discard(idx)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._members)
+
 
 # ── Core stores ────────────────────────────────────────────────────────────────
 
 users: Dict[str, dict] = {}
 usernames: Dict[str, str] = {}          # lowercase_username → user_id
+user_index: Dict[str, int] = {}         # user_id → dense int, assigned at creation
+user_ids: List[str] = []                # dense int → user_id
 
-tweets: Dict[str, dict] = {}
+tweets: Dict[str, TweetRec] = {}
+tweets_by_user: Dict[str, List[str]] = {}  # user_id → [tweet_id, ...] in creation order
 
 followers: Dict[str, Set[str]] = {}     # user_id → set of follower user_ids
 following: Dict[str, Set[str]] = {}     # user_id → set of user_ids this user follows
 
-likes: Dict[str, Set[str]] = {}         # tweet_id → set of user_ids
+likes: Dict[str, LikerSet] = {}         # tweet_id → liker user indexes
+likes_by_user: Dict[str, Set[str]] = {} # user_id → set of liked tweet_ids
+
+# Posting lists are dicts used as insertion-ordered sets: O(1) add/remove, and
+# iteration order is creation order, so reversed() yields newest first.
+hashtag_index: Dict[str, Dict[str, None]] = {}   # lowercase_hashtag → {tweet_id: None}
+mentions_index: Dict[str, Dict[str, None]] = {}  # lowercase_username → {tweet_id: None}
+
+# ── Denormalised counters ──────────────────────────────────────────────────────
+
+tweet_counts: Dict[str, int] = {}       # user_id → number of tweets authored
+retweet_counts: Dict[str, int] = {}     # original_tweet_id → number of retweets
+quote_counts: Dict[str, int] = {}       # original_tweet_id → number of quote tweets
+hashtag_counts: Dict[str, int] = {}     # lowercase_hashtag → number of live tweets
+
+
+# ── Response cache ─────────────────────────────────────────────────────────────
+
+# Every write handler bumps `version`, invalidating all cached responses.
+version: int = 0
+# Narrower counter for caches that only depend on hashtag_counts (trending),
+# so likes, follows and tag-less tweets don't evict them.
+hashtag_version: int = 0
+# Random per-process tag mixed into every ETag. The counters above restart at 0
+# on process start and in reset_storage(), so without it an ETag issued before
+# a restart could match a different payload after it.
+cache_epoch: str = os.urandom(4).hex()
+response_cache: Dict[tuple, Tuple[int, str, bytes]] = {}
+
+# Per-user rendered UserOut dicts. Unlike response_cache this is not keyed on
+# the global version: any write that changes a user's fields or counts pops
+# that user's entry, so unrelated writes leave it warm.
+user_out_cache: Dict[str, dict] = {}
 
-hashtag_index: Dict[str, List[str]] = {}  # lowercase_hashtag → [tweet_id, ...]
+
+# ── IDs and timestamps ─────────────────────────────────────────────────────────
+
+# Process-wide sequence; deliberately NOT reset so IDs never repeat across tests.
+_id_counter = itertools.count(1)
+
+
+def new_id() -> str:
+    """
+    Return a new unique, time-ordered ID string.
+
+    Cheaper than str(uuid4()) (no os.urandom call) and roughly sortable by
+    creation time: a fixed-width hex nanosecond timestamp plus a sequence number.
+    """
+    return f"{time.time_ns():016x}{next(_id_counter):x}"
+
+
+# (epoch_second, "YYYY-MM-DDTHH:MM:SS") for the last second now_iso formatted
+_iso_second_cache: Tuple[int, str] = (-1, "")
+
+
+def now_iso(ns: Optional[int] = None) -> str:
+    """
+    Return ns (default: now), epoch nanoseconds, as a UTC ISO-8601 string.
+
+    Same shape as datetime.now(timezone.utc).isoformat() (always with
+    microseconds), but avoids building a datetime per call: the
+    "YYYY-MM-DDTHH:MM:SS" prefix is formatted once per wall-clock second
+    and only the fraction is added.
+    """
+    global _iso_second_cache
+    if ns is None:
+        ns = time.time_ns()
+    secs, rem_ns = divmod(ns, 1_000_000_000)
+    cached_secs, prefix = _iso_second_cache
+    if secs != cached_secs:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(secs))
+        _iso_second_cache = (secs, prefix)
+    return f"{prefix}.{rem_ns // 1000:06d}+00:00"
 
 
 # ── Reset ──────────────────────────────────────────────────────────────────────
 
 def reset_storage() -> None:
-    """Clear all in-memory stores. Used between test runs."""
-    users.clear()
-    usernames.clear()
-    tweets.clear()
-    followers.clear()
-    following.clear()
-    likes.clear()
-    hashtag_index.clear()
+    """
+    Replace every in-memory store with a fresh empty one. Used between test runs.
+
+    Rebinding drops the old containers wholesale instead of emptying them one
+    by one. This is only safe because every caller reaches the stores as
+    `storage.<name>` at call time — never `from twitter_app.storage import
+    <name>`, which would keep pointing at the discarded object.
+    """
+    global users, usernames, user_index, user_ids, tweets, tweets_by_user
+    global followers, following, likes, likes_by_user, hashtag_index, mentions_index
+    global tweet_counts, retweet_counts, quote_counts, hashtag_counts
+    global version, hashtag_version, cache_epoch, response_cache, user_out_cache
+    users = {}
+    usernames = {}
+    user_index = {}
+    user_ids = []
+    tweets = {}
+    tweets_by_user = {}
+    followers = {}
+    following = {}
+    likes = {}
+    likes_by_user = {}
+    hashtag_index = {}
+    mentions_index = {}
+    tweet_counts = {}
+    retweet_counts = {}
+    quote_counts = {}
+    hashtag_counts = {}
+    version = 0
+    hashtag_version = 0
+    # The counters restart, so ETags from before the reset must stop matching
+    cache_epoch = os.urandom(4).hex()
+    response_cache = {}
+    user_out_cache = {}
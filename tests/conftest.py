@@ -2,36 +2,85 @@
 Pytest configuration and fixtures for the Twitter Microblogging App test suite.
 
 Fixtures:
-  reset   (autouse, function scope) — wipes all in-memory storage before AND after each test.
-  client  (function scope)          — a FastAPI TestClient backed by the app.
+  reset   (autouse, function scope) — wipes all in-memory storage before each test.
+  author  (function scope)          — a stored user for tests that just need a valid author.
+  client  (session scope)           — one FastAPI TestClient, started once for the run.
+  aclient (module scope)            — an httpx AsyncClient calling the app in-process.
+  anyio_backend (session scope)     — runs `pytest.mark.anyio` tests on asyncio.
 """
 
+from typing import AsyncIterator, Iterator
+
 import pytest
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 
 from twitter_app.main import app
 from twitter_app import storage
+from twitter_app.tests.factories import make_user
 
 
 @pytest.fixture(autouse=True)
-def reset():
+def reset() -> None:
     """
-    Reset all in-memory storage before and after every test.
+    Reset all in-memory storage before every test.
 
     autouse=True means this runs automatically for every test in the suite
-    without needing to be listed in the test function's parameters.
+    without needing to be listed in the test function's parameters. Only the
+    data layer is reset; the app and clients are built once. A reset after
+    each test as well would be redundant, since the next test always starts
+    with one.
     """
     storage.reset_storage()
-    yield
-    storage.reset_storage()
 
 
 @pytest.fixture
-def client() -> TestClient:
+def author(reset: None) -> dict:
     """
-    Return a synchronous FastAPI TestClient.
+    Return a freshly stored user, as a UserOut-shaped dict.
+
+    Written straight to storage instead of through POST /users, for tests that
+    only need some valid user_id to post with. It can't outlive the test,
+    because `reset` wipes storage before the next one; depending on it
+    explicitly makes sure the user is created after that wipe.
+    """
+    return make_user("author", "Author")
+
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    """
+    Yield a synchronous FastAPI TestClient shared by the whole session.
 
     The TestClient uses httpx under the hood and supports all HTTP methods.
-    Storage is clean for each test thanks to the `reset` autouse fixture.
+    Entering it as a context manager runs the app lifespan once and keeps a
+    single event-loop portal alive, instead of starting one per request.
+    The client holds no per-test state: storage is still wiped for each test
+    by the function-scoped `reset` autouse fixture.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    """
+    Run async tests on asyncio via anyio's bundled pytest plugin.
+
+    Session scope lets the module-scoped `aclient` fixture outlive a single test.
+    """
+    return "asyncio"
+
+
+@pytest.fixture(scope="module")
+async def aclient() -> AsyncIterator[AsyncClient]:
+    """
+    Yield an httpx AsyncClient that calls the app over an in-process ASGI transport.
+
+    Requests run on the test's own event loop, skipping the thread hop that
+    TestClient's sync portal makes for every call. Modules using it mark their
+    tests with `pytestmark = pytest.mark.anyio`.
     """
-    return TestClient(app)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        yield client
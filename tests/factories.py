@@ -0,0 +1,70 @@
+"""
+Shared test data factories.
+
+make_* seed storage directly through the same helpers the routers use,
+skipping the TestClient round trip (ASGI scope, request validation, JSON
+encode/decode). Use them to set up data a test only reads.
+
+create_* / follow_user go through the HTTP endpoints on the AsyncClient and
+assert the expected status, for tests that exercise those endpoints; post_*
+do the same on the sync TestClient and return the whole response body.
+"""
+from __future__ import annotations
+
+from typing import Iterable, List, Optional
+
+from fastapi.testclient import TestClient
+from httpx import AsyncClient
+
+from twitter_app.routers.tweets import _publish_tweet
+from twitter_app.routers.users import _build_user_out, _register_user
+
+
+# ── Direct storage factories ───────────────────────────────────────────────────
+
+def make_user(username: str, display_name: str, bio: Optional[str] = None) -> dict:
+    """Register a user in storage and return it as a UserOut-shaped dict."""
+    return _build_user_out(_register_user(username, display_name, bio))
+
+
+def make_tweets(user_id: str, contents: Iterable[str]) -> List[str]:
+    """Publish one original tweet per content string and return their IDs in order."""
+    return [_publish_tweet(user_id, content).id for content in contents]
+
+
+# ── HTTP helpers ───────────────────────────────────────────────────────────────
+
+async def create_user(
+    aclient: AsyncClient, username: str = "alice", display_name: str = "Alice"
+) -> str:
+    """POST /users and return the new user's ID."""
+    r = await aclient.post("/users", json={"username": username, "display_name": display_name})
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+async def create_tweet(aclient: AsyncClient, user_id: str, content: str = "Hello world") -> str:
+    """POST /tweets and return the new tweet's ID."""
+    r = await aclient.post("/tweets", json={"user_id": user_id, "content": content})
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+async def follow_user(aclient: AsyncClient, follower_id: str, target_id: str) -> None:
+    """Have follower_id follow target_id via POST /users/{id}/follow."""
+    r = await aclient.post(f"/users/{follower_id}/follow", json={"target_user_id": target_id})
+    assert r.status_code == 200, r.text
+
+
+def post_user(client: TestClient, username: str = "alice", display_name: str = "Alice") -> dict:
+    """POST /users and return the created user."""
+    r = client.post("/users", json={"username": username, "display_name": display_name})
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+def post_tweet(client: TestClient, user_id: str, content: str = "Hello world") -> dict:
+    """POST /tweets and return the created tweet."""
+    r = client.post("/tweets", json={"user_id": user_id, "content": content})
+    assert r.status_code == 201, r.text
+    return r.json()
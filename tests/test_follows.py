@@ -9,14 +9,10 @@ from __future__ import annotations
 import pytest
 from fastapi.testclient import TestClient
 
-
-# ── Helpers ──────────────────────────────────────────────────────────────────
+from twitter_app.tests.factories import make_user
 
 
-def _create_user(client: TestClient, username: str = "alice", display_name: str = "Alice") -> dict:
-    r = client.post("/users", json={"username": username, "display_name": display_name})
-    assert r.status_code == 201, r.text
-    return r.json()
+# ── Helpers ──────────────────────────────────────────────────────────────────
 
 
 def _follow(client: TestClient, follower_id: str, target_id: str) -> None:
@@ -30,20 +26,20 @@ def _follow(client: TestClient, follower_id: str, target_id: str) -> None:
 class TestFollow:
     def test_follow_returns_200(self, client: TestClient) -> None:
         """POST /users/{id}/follow returns 200 on success."""
-        alice = _create_user(client, "alice", "Alice")
-        bob = _create_user(client, "bob", "Bob")
+        alice = make_user("alice", "Alice")
+        bob = make_user("bob", "Bob")
         r = client.post(f"/users/{alice['id']}/follow", json={"target_user_id": bob["id"]})
         assert r.status_code == 200
 
     def test_follow_self_returns_400(self, client: TestClient) -> None:
         """POST /users/{id}/follow with own ID returns 400."""
-        alice = _create_user(client, "alice", "Alice")
+        alice = make_user("alice", "Alice")
         r = client.post(f"/users/{alice['id']}/follow", json={"target_user_id": alice["id"]})
         assert r.status_code == 400
 
     def test_follow_nonexistent_follower_404(self, client: TestClient) -> None:
         """POST /users/bad-id/follow returns 404 when the follower user doesn't exist."""
-        bob = _create_user(client, "bob", "Bob")
+        bob = make_user("bob", "Bob")
         r = client.post(
             "/users/ghost-follower-id/follow",
             json={"target_user_id": bob["id"]},
@@ -52,39 +48,39 @@ class TestFollow:
 
     def test_follow_nonexistent_target_404(self, client: TestClient) -> None:
         """POST /users/{id}/follow returns 404 when target user doesn't exist."""
-        alice = _create_user(client, "alice", "Alice")
+        alice = make_user("alice", "Alice")
         r = client.post(f"/users/{alice['id']}/follow", json={"target_user_id": "ghost-target"})
         assert r.status_code == 404
 
     def test_follow_duplicate_returns_409(self, client: TestClient) -> None:
         """POST /users/{id}/follow when already following returns 409."""
-        alice = _create_user(client, "alice", "Alice")
-        bob = _create_user(client, "bob", "Bob")
+        alice = make_user("alice", "Alice")
+        bob = make_user("bob", "Bob")
         _follow(client, alice["id"], bob["id"])
         r = client.post(f"/users/{alice['id']}/follow", json={"target_user_id": bob["id"]})
         assert r.status_code == 409
 
     def test_follow_increments_following_count(self, client: TestClient) -> None:
         """following_count on the follower increments after follow."""
-        alice = _create_user(client, "alice", "Alice")
-        bob = _create_user(client, "bob", "Bob")
+        alice = make_user("alice", "Alice")
+        bob = make_user("bob", "Bob")
         _follow(client, alice["id"], bob["id"])
         r = client.get(f"/users/{alice['id']}")
         assert r.json()["following_count"] == 1
 
     def test_follow_increments_followers_count(self, client: TestClient) -> None:
         """followers_count on the target increments after follow."""
-        alice = _create_user(client, "alice", "Alice")
-        bob = _create_user(client, "bob", "Bob")
+        alice = make_user("alice", "Alice")
+        bob = make_user("bob", "Bob")
         _follow(client, alice["id"], bob["id"])
         r = client.get(f"/users/{bob['id']}")
         assert r.json()["followers_count"] == 1
 
     def test_follow_multiple_users_counts_correctly(self, client: TestClient) -> None:
         """following_count reflects multiple follows."""
-        alice = _create_user(client, "alice", "Alice")
-        bob = _create_user(client, "bob", "Bob")
-        carol = _create_user(client, "carol", "Carol")
+        alice = make_user("alice", "Alice")
+        bob = make_user("bob", "Bob")
+        carol = make_user("carol", "Carol")
         _follow(client, alice["id"], bob["id"])
         _follow(client, alice["id"], carol["id"])
         r = client.get(f"/users/{alice['id']}")
@@ -94,23 +90,23 @@ class TestFollow:
 class TestUnfollow:
     def test_unfollow_returns_200(self, client: TestClient) -> None:
         """DELETE /users/{id}/follow returns 200 on success."""
-        alice = _create_user(client, "alice", "Alice")
-        bob = _create_user(client, "bob", "Bob")
+        alice = make_user("alice", "Alice")
+        bob = make_user("bob", "Bob")
         _follow(client, alice["id"], bob["id"])
         r = client.delete(f"/users/{alice['id']}/follow?target_user_id={bob['id']}")
         assert r.status_code == 200
 
     def test_unfollow_not_following_404(self, client: TestClient) -> None:
         """DELETE /users/{id}/follow returns 404 when the follow relationship doesn't exist."""
-        alice = _create_user(client, "alice", "Alice")
-        bob = _create_user(client, "bob", "Bob")
+        alice = make_user("alice", "Alice")
+        bob = make_user("bob", "Bob")
         r = client.delete(f"/users/{alice['id']}/follow?target_user_id={bob['id']}")
         assert r.status_code == 404
 
     def test_unfollow_decrements_following_count(self, client: TestClient) -> None:
         """following_count decrements after unfollow."""
-        alice = _create_user(client, "alice", "Alice")
-        bob = _create_user(client, "bob", "Bob")
+        alice = make_user("alice", "Alice")
+        bob = make_user("bob", "Bob")
         _follow(client, alice["id"], bob["id"])
         client.delete(f"/users/{alice['id']}/follow?target_user_id={bob['id']}")
         r = client.get(f"/users/{alice['id']}")
@@ -118,8 +114,8 @@ class TestUnfollow:
 
     def test_unfollow_decrements_followers_count(self, client: TestClient) -> None:
         """followers_count decrements after unfollow."""
-        alice = _create_user(client, "alice", "Alice")
-        bob = _create_user(client, "bob", "Bob")
+        alice = make_user("alice", "Alice")
+        bob = make_user("bob", "Bob")
         _follow(client, alice["id"], bob["id"])
         client.delete(f"/users/{alice['id']}/follow?target_user_id={bob['id']}")
         r = client.get(f"/users/{bob['id']}")
@@ -129,8 +125,8 @@ class TestUnfollow:
 class TestFollowersAndFollowingLists:
     def test_get_followers_200(self, client: TestClient) -> None:
         """GET /users/{id}/followers returns 200 with a list of follower UserOut objects."""
-        alice = _create_user(client, "alice", "Alice")
-        bob = _create_user(client, "bob", "Bob")
+        alice = make_user("alice", "Alice")
+        bob = make_user("bob", "Bob")
         _follow(client, bob["id"], alice["id"])  # bob follows alice
         r = client.get(f"/users/{alice['id']}/followers")
         assert r.status_code == 200
@@ -140,15 +136,15 @@ class TestFollowersAndFollowingLists:
 
     def test_get_followers_empty(self, client: TestClient) -> None:
         """GET /users/{id}/followers returns empty list when user has no followers."""
-        alice = _create_user(client, "alice", "Alice")
+        alice = make_user("alice", "Alice")
         r = client.get(f"/users/{alice['id']}/followers")
         assert r.status_code == 200
         assert r.json() == []
 
     def test_get_following_200(self, client: TestClient) -> None:
         """GET /users/{id}/following returns 200 with a list of followed UserOut objects."""
-        alice = _create_user(client, "alice", "Alice")
-        bob = _create_user(client, "bob", "Bob")
+        alice = make_user("alice", "Alice")
+        bob = make_user("bob", "Bob")
         _follow(client, alice["id"], bob["id"])  # alice follows bob
         r = client.get(f"/users/{alice['id']}/following")
         assert r.status_code == 200
@@ -158,15 +154,15 @@ class TestFollowersAndFollowingLists:
 
     def test_get_following_empty(self, client: TestClient) -> None:
         """GET /users/{id}/following returns empty list when user follows nobody."""
-        alice = _create_user(client, "alice", "Alice")
+        alice = make_user("alice", "Alice")
         r = client.get(f"/users/{alice['id']}/following")
         assert r.status_code == 200
         assert r.json() == []
 
     def test_followers_list_reflects_unfollow(self, client: TestClient) -> None:
         """After unfollow, the follower no longer appears in the followers list."""
-        alice = _create_user(client, "alice", "Alice")
-        bob = _create_user(client, "bob", "Bob")
+        alice = make_user("alice", "Alice")
+        bob = make_user("bob", "Bob")
         _follow(client, bob["id"], alice["id"])
         client.delete(f"/users/{bob['id']}/follow?target_user_id={alice['id']}")
         r = client.get(f"/users/{alice['id']}/followers")
@@ -174,8 +170,8 @@ class TestFollowersAndFollowingLists:
 
     def test_following_list_reflects_unfollow(self, client: TestClient) -> None:
         """After unfollow, the target no longer appears in the following list."""
-        alice = _create_user(client, "alice", "Alice")
-        bob = _create_user(client, "bob", "Bob")
+        alice = make_user("alice", "Alice")
+        bob = make_user("bob", "Bob")
         _follow(client, alice["id"], bob["id"])
         client.delete(f"/users/{alice['id']}/follow?target_user_id={bob['id']}")
         r = client.get(f"/users/{alice['id']}/following")
@@ -183,8 +179,8 @@ class TestFollowersAndFollowingLists:
 
     def test_followers_list_userout_shape(self, client: TestClient) -> None:
         """Each entry in the followers list is a valid UserOut with expected fields."""
-        alice = _create_user(client, "alice", "Alice")
-        bob = _create_user(client, "bob", "Bob")
+        alice = make_user("alice", "Alice")
+        bob = make_user("bob", "Bob")
         _follow(client, bob["id"], alice["id"])
         followers = client.get(f"/users/{alice['id']}/followers").json()
         assert len(followers) == 1
@@ -195,3 +191,16 @@ class TestFollowersAndFollowingLists:
         assert "followers_count" in follower
         assert "following_count" in follower
         assert "tweet_count" in follower
+
+    def test_followers_list_reports_live_tweet_count(self, client: TestClient) -> None:
+        """tweet_count in the followers list tracks the follower's creates and deletes."""
+        alice = make_user("alice", "Alice")
+        bob = make_user("bob", "Bob")
+        _follow(client, bob["id"], alice["id"])
+        tweet_ids = [
+            client.post("/tweets", json={"user_id": bob["id"], "content": f"post {i}"}).json()["id"]
+            for i in range(3)
+        ]
+        client.delete(f"/tweets/{tweet_ids[0]}")
+        followers = client.get(f"/users/{alice['id']}/followers").json()
+        assert followers[0]["tweet_count"] == 2
@@ -8,6 +8,7 @@ Covers:
   - Deleted tweets don't appear in results
   - Multiple tweets share same hashtag
   - Tag can be requested with or without trailing spaces (URL encoding handled by FastAPI)
+  - ETag / If-None-Match: 304 while unchanged, 200 with a new ETag after a like
 """
 
 from __future__ import annotations
@@ -15,15 +16,11 @@ from __future__ import annotations
 import pytest
 from fastapi.testclient import TestClient
 
-
-# ── Helpers ─────────────────────────────────────────────────────────────────
+from twitter_app import storage
+from twitter_app.tests.factories import make_user
 
 
-def _create_user(client: TestClient, username: str, display_name: str) -> str:
-    """Create a user and return their ID."""
-    r = client.post("/users", json={"username": username, "display_name": display_name})
-    assert r.status_code == 201
-    return r.json()["id"]
+# ── Helpers ─────────────────────────────────────────────────────────────────
 
 
 def _create_tweet(client: TestClient, user_id: str, content: str) -> str:
@@ -38,7 +35,7 @@ def _create_tweet(client: TestClient, user_id: str, content: str) -> str:
 
 def test_hashtag_returns_matching_tweets(client: TestClient) -> None:
     """GET /hashtags/{tag}/tweets returns tweets that contain the hashtag."""
-    user_id = _create_user(client, "alice", "Alice")
+    user_id = make_user("alice", "Alice")["id"]
     tweet_id = _create_tweet(client, user_id, "Hello #world today")
 
     r = client.get("/hashtags/world/tweets")
@@ -49,7 +46,7 @@ def test_hashtag_returns_matching_tweets(client: TestClient) -> None:
 
 def test_hashtag_case_insensitive_uppercase_tag(client: TestClient) -> None:
     """#Python tweet is found when querying with 'python' (lowercase)."""
-    user_id = _create_user(client, "bob", "Bob")
+    user_id = make_user("bob", "Bob")["id"]
     tweet_id = _create_tweet(client, user_id, "I love #Python")
 
     r = client.get("/hashtags/python/tweets")
@@ -60,7 +57,7 @@ def test_hashtag_case_insensitive_uppercase_tag(client: TestClient) -> None:
 
 def test_hashtag_case_insensitive_mixed_case(client: TestClient) -> None:
     """#Python tweet is also found when querying with 'PYTHON' (all caps)."""
-    user_id = _create_user(client, "carol", "Carol")
+    user_id = make_user("carol", "Carol")["id"]
     tweet_id = _create_tweet(client, user_id, "I love #Python")
 
     r = client.get("/hashtags/PYTHON/tweets")
@@ -78,7 +75,7 @@ def test_hashtag_returns_empty_for_unused_tag(client: TestClient) -> None:
 
 def test_deleted_tweets_excluded_from_hashtag_results(client: TestClient) -> None:
     """After a tweet is deleted, it no longer appears in hashtag results."""
-    user_id = _create_user(client, "dave", "Dave")
+    user_id = make_user("dave", "Dave")["id"]
     tweet_id = _create_tweet(client, user_id, "Going away #byebye")
 
     # Confirm it appears before deletion
@@ -96,7 +93,7 @@ def test_deleted_tweets_excluded_from_hashtag_results(client: TestClient) -> Non
 
 def test_hashtag_multiple_tweets(client: TestClient) -> None:
     """Multiple tweets sharing a hashtag all appear in the results."""
-    user_id = _create_user(client, "eve", "Eve")
+    user_id = make_user("eve", "Eve")["id"]
     t1 = _create_tweet(client, user_id, "First #tech post")
     t2 = _create_tweet(client, user_id, "Second #tech post")
     t3 = _create_tweet(client, user_id, "Third #tech post")
@@ -111,7 +108,7 @@ def test_hashtag_multiple_tweets(client: TestClient) -> None:
 
 def test_hashtag_tweet_not_in_other_hashtag(client: TestClient) -> None:
     """A tweet with #foo does NOT appear in results for #bar."""
-    user_id = _create_user(client, "frank", "Frank")
+    user_id = make_user("frank", "Frank")["id"]
     _create_tweet(client, user_id, "About #foo")
 
     r = client.get("/hashtags/bar/tweets")
@@ -121,7 +118,7 @@ def test_hashtag_tweet_not_in_other_hashtag(client: TestClient) -> None:
 
 def test_hashtag_results_sorted_newest_first(client: TestClient) -> None:
     """Hashtag results are returned newest-first."""
-    user_id = _create_user(client, "grace", "Grace")
+    user_id = make_user("grace", "Grace")["id"]
     t1 = _create_tweet(client, user_id, "First #order post")
     t2 = _create_tweet(client, user_id, "Second #order post")
     t3 = _create_tweet(client, user_id, "Third #order post")
@@ -130,3 +127,41 @@ def test_hashtag_results_sorted_newest_first(client: TestClient) -> None:
     assert r.status_code == 200
     ids = [t["id"] for t in r.json()]
     assert ids.index(t3) < ids.index(t2) < ids.index(t1)
+
+
+def test_deleting_last_tweet_drops_tag_from_index(client: TestClient) -> None:
+    """Once a tag's last tweet is deleted, its empty posting list is released."""
+    user_id = make_user("heidi", "Heidi")["id"]
+    tweet_id = _create_tweet(client, user_id, "Short-lived #ephemeral for @nobody")
+    client.delete(f"/tweets/{tweet_id}")
+
+    assert "ephemeral" not in storage.hashtag_index
+    assert "nobody" not in storage.mentions_index
+    r = client.get("/hashtags/ephemeral/tweets")
+    assert r.json() == []
+
+
+def test_hashtag_etag_returns_304_when_unchanged(client: TestClient) -> None:
+    """A repeated GET with a matching If-None-Match returns 304 and no body."""
+    user_id = make_user("ivan", "Ivan")["id"]
+    _create_tweet(client, user_id, "Hello #cached")
+    etag = client.get("/hashtags/cached/tweets").headers["etag"]
+
+    r = client.get("/hashtags/cached/tweets", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.headers["etag"] == etag
+    assert r.content == b""
+
+
+def test_hashtag_etag_changes_after_like(client: TestClient) -> None:
+    """A like bumps storage.version, so the old ETag gets a 200 with fresh counts."""
+    user_id = make_user("judy", "Judy")["id"]
+    tweet_id = _create_tweet(client, user_id, "Like me #fresh")
+    etag = client.get("/hashtags/fresh/tweets").headers["etag"]
+
+    client.post(f"/tweets/{tweet_id}/like", json={"user_id": user_id})
+
+    r = client.get("/hashtags/fresh/tweets", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+    assert r.json()[0]["like_count"] == 1
@@ -8,6 +8,8 @@ Covers:
   - Unlike (200)
   - Unlike tweet user never liked returns 404
   - like_count on tweet GET increases after like and decreases after unlike
+  - Liker bitset len() counts distinct members
+  - LikerSet keeps sparse likers in a set and packs dense ones into a bitset
 """
 
 from __future__ import annotations
@@ -15,15 +17,11 @@ from __future__ import annotations
 import pytest
 from fastapi.testclient import TestClient
 
-
-# ── Helpers ─────────────────────────────────────────────────────────────────
+from twitter_app import storage
+from twitter_app.tests.factories import make_user
 
 
-def _create_user(client: TestClient, username: str, display_name: str) -> str:
-    """Create a user and return their ID."""
-    r = client.post("/users", json={"username": username, "display_name": display_name})
-    assert r.status_code == 201
-    return r.json()["id"]
+# ── Helpers ─────────────────────────────────────────────────────────────────
 
 
 def _create_tweet(client: TestClient, user_id: str, content: str = "Hello world") -> str:
@@ -38,7 +36,7 @@ def _create_tweet(client: TestClient, user_id: str, content: str = "Hello world"
 
 def test_like_tweet_returns_200(client: TestClient) -> None:
     """POST /tweets/{id}/like with a valid user returns 200."""
-    user_id = _create_user(client, "alice", "Alice")
+    user_id = make_user("alice", "Alice")["id"]
     tweet_id = _create_tweet(client, user_id)
 
     r = client.post(f"/tweets/{tweet_id}/like", json={"user_id": user_id})
@@ -50,7 +48,7 @@ def test_like_tweet_returns_200(client: TestClient) -> None:
 
 def test_like_tweet_response_contains_user_id(client: TestClient) -> None:
     """Like response body includes like_count (verifying the correct tweet was liked)."""
-    user_id = _create_user(client, "bob", "Bob")
+    user_id = make_user("bob", "Bob")["id"]
     tweet_id = _create_tweet(client, user_id)
 
     r = client.post(f"/tweets/{tweet_id}/like", json={"user_id": user_id})
@@ -61,7 +59,7 @@ def test_like_tweet_response_contains_user_id(client: TestClient) -> None:
 
 def test_double_like_returns_409(client: TestClient) -> None:
     """POST /tweets/{id}/like twice by the same user returns 409 Conflict."""
-    user_id = _create_user(client, "carol", "Carol")
+    user_id = make_user("carol", "Carol")["id"]
     tweet_id = _create_tweet(client, user_id)
 
     client.post(f"/tweets/{tweet_id}/like", json={"user_id": user_id})
@@ -71,15 +69,24 @@ def test_double_like_returns_409(client: TestClient) -> None:
 
 def test_like_nonexistent_tweet_returns_404(client: TestClient) -> None:
     """POST /tweets/{id}/like with a non-existent tweet_id returns 404."""
-    user_id = _create_user(client, "dave", "Dave")
+    user_id = make_user("dave", "Dave")["id"]
 
     r = client.post("/tweets/nonexistent-id/like", json={"user_id": user_id})
     assert r.status_code == 404
 
 
+def test_like_by_nonexistent_user_returns_404(client: TestClient) -> None:
+    """POST /tweets/{id}/like with a non-existent user_id returns 404."""
+    user_id = make_user("dave", "Dave")["id"]
+    tweet_id = _create_tweet(client, user_id)
+
+    r = client.post(f"/tweets/{tweet_id}/like", json={"user_id": "ghost-user-id"})
+    assert r.status_code == 404
+
+
 def test_unlike_tweet_returns_200(client: TestClient) -> None:
     """DELETE /tweets/{id}/like?user_id=X after a like returns 200."""
-    user_id = _create_user(client, "eve", "Eve")
+    user_id = make_user("eve", "Eve")["id"]
     tweet_id = _create_tweet(client, user_id)
 
     client.post(f"/tweets/{tweet_id}/like", json={"user_id": user_id})
@@ -90,7 +97,7 @@ def test_unlike_tweet_returns_200(client: TestClient) -> None:
 
 def test_unlike_tweet_not_previously_liked_returns_404(client: TestClient) -> None:
     """DELETE /tweets/{id}/like when user never liked the tweet returns 404."""
-    user_id = _create_user(client, "frank", "Frank")
+    user_id = make_user("frank", "Frank")["id"]
     tweet_id = _create_tweet(client, user_id)
 
     r = client.delete(f"/tweets/{tweet_id}/like", params={"user_id": user_id})
@@ -99,8 +106,8 @@ def test_unlike_tweet_not_previously_liked_returns_404(client: TestClient) -> No
 
 def test_like_count_increases_on_tweet_get(client: TestClient) -> None:
     """GET /tweets/{id} reflects the current like_count after likes are added."""
-    alice_id = _create_user(client, "grace", "Grace")
-    bob_id = _create_user(client, "henry", "Henry")
+    alice_id = make_user("grace", "Grace")["id"]
+    bob_id = make_user("henry", "Henry")["id"]
     tweet_id = _create_tweet(client, alice_id)
 
     # Before any likes
@@ -121,7 +128,7 @@ def test_like_count_increases_on_tweet_get(client: TestClient) -> None:
 
 def test_like_count_decreases_after_unlike(client: TestClient) -> None:
     """GET /tweets/{id} shows decreased like_count after an unlike."""
-    user_id = _create_user(client, "iris", "Iris")
+    user_id = make_user("iris", "Iris")["id"]
     tweet_id = _create_tweet(client, user_id)
 
     client.post(f"/tweets/{tweet_id}/like", json={"user_id": user_id})
@@ -135,13 +142,51 @@ def test_like_count_decreases_after_unlike(client: TestClient) -> None:
 
 def test_multiple_users_can_like_same_tweet(client: TestClient) -> None:
     """Multiple distinct users can each like the same tweet."""
-    owner_id = _create_user(client, "jake", "Jake")
+    owner_id = make_user("jake", "Jake")["id"]
     tweet_id = _create_tweet(client, owner_id)
 
     for i in range(5):
-        uid = _create_user(client, f"liker{i}", f"Liker {i}")
+        uid = make_user(f"liker{i}", f"Liker {i}")["id"]
         r = client.post(f"/tweets/{tweet_id}/like", json={"user_id": uid})
         assert r.status_code == 200
 
     r = client.get(f"/tweets/{tweet_id}")
     assert r.json()["like_count"] == 5
+
+
+def test_liker_bitset_len_tracks_distinct_members() -> None:
+    """Bitset len() counts distinct set bits, ignoring repeat adds and absent discards."""
+    likers = storage.Bitset()
+    likers.add(1_000_000)
+    likers.add(1_000_000)
+    likers.add(3)
+    likers.discard(7)
+    likers.discard(2_000_000)
+    assert len(likers) == 2
+    likers.discard(1_000_000)
+    assert len(likers) == 1
+    assert list(likers) == [3]
+
+
+def test_liker_set_stays_a_set_for_sparse_likers() -> None:
+    """A few likes from high user indexes never allocate a max_index-sized bitset."""
+    likers = storage.LikerSet()
+    for idx in (5, 1_000_000, 2_000_000):
+        likers.add(idx)
+    assert isinstance(likers._members, set)
+    assert len(likers) == 3
+    assert 1_000_000 in likers
+
+
+def test_liker_set_packs_dense_likers_and_unpacks_on_a_far_index() -> None:
+    """Dense likers switch to a Bitset; a far outlier switches back; members survive both."""
+    likers = storage.LikerSet()
+    for idx in range(0, 1000, 2):
+        likers.add(idx)
+    assert isinstance(likers._members, storage.Bitset)
+
+    likers.add(5_000_000)
+    likers.discard(0)
+    assert isinstance(likers._members, set)
+    assert len(likers) == 500
+    assert sorted(likers) == list(range(2, 1000, 2)) + [5_000_000]
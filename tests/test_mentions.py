@@ -14,99 +14,87 @@ Covers:
 from __future__ import annotations
 
 import pytest
-from fastapi.testclient import TestClient
+from httpx import AsyncClient
 
+from twitter_app.tests.factories import create_tweet, create_user
 
-# ── Helpers ─────────────────────────────────────────────────────────────────
-
-
-def _create_user(client: TestClient, username: str, display_name: str) -> str:
-    """Create a user and return their ID."""
-    r = client.post("/users", json={"username": username, "display_name": display_name})
-    assert r.status_code == 201
-    return r.json()["id"]
-
-
-def _create_tweet(client: TestClient, user_id: str, content: str) -> str:
-    """Create a tweet and return its ID."""
-    r = client.post("/tweets", json={"user_id": user_id, "content": content})
-    assert r.status_code == 201
-    return r.json()["id"]
+# Every test here is a coroutine driven by anyio's pytest plugin
+pytestmark = pytest.mark.anyio
 
 
 # ── Tests ────────────────────────────────────────────────────────────────────
 
 
-def test_mentions_returns_tweets_mentioning_user(client: TestClient) -> None:
+async def test_mentions_returns_tweets_mentioning_user(aclient: AsyncClient) -> None:
     """GET /users/{id}/mentions returns tweets that contain @username."""
-    alice_id = _create_user(client, "alice", "Alice")
-    bob_id = _create_user(client, "bob", "Bob")
+    alice_id = await create_user(aclient, "alice", "Alice")
+    bob_id = await create_user(aclient, "bob", "Bob")
 
-    tweet_id = _create_tweet(client, bob_id, "Hey @alice, check this out!")
+    tweet_id = await create_tweet(aclient, bob_id, "Hey @alice, check this out!")
 
-    r = client.get(f"/users/{alice_id}/mentions")
+    r = await aclient.get(f"/users/{alice_id}/mentions")
     assert r.status_code == 200
     ids = [t["id"] for t in r.json()]
     assert tweet_id in ids
 
 
-def test_mentions_returns_404_for_nonexistent_user(client: TestClient) -> None:
+async def test_mentions_returns_404_for_nonexistent_user(aclient: AsyncClient) -> None:
     """GET /users/{id}/mentions returns 404 when user does not exist."""
-    r = client.get("/users/nonexistent-id/mentions")
+    r = await aclient.get("/users/nonexistent-id/mentions")
     assert r.status_code == 404
 
 
-def test_mentions_returns_empty_when_no_tweets_mention_user(client: TestClient) -> None:
+async def test_mentions_returns_empty_when_no_tweets_mention_user(aclient: AsyncClient) -> None:
     """GET /users/{id}/mentions returns [] when nobody has mentioned the user."""
-    alice_id = _create_user(client, "alice", "Alice")
-    bob_id = _create_user(client, "bob", "Bob")
+    alice_id = await create_user(aclient, "alice", "Alice")
+    bob_id = await create_user(aclient, "bob", "Bob")
 
     # Bob tweets but doesn't mention Alice
-    _create_tweet(client, bob_id, "Nothing to see here")
+    await create_tweet(aclient, bob_id, "Nothing to see here")
 
-    r = client.get(f"/users/{alice_id}/mentions")
+    r = await aclient.get(f"/users/{alice_id}/mentions")
     assert r.status_code == 200
     assert r.json() == []
 
 
-def test_mentions_case_insensitive_lowercase_mention(client: TestClient) -> None:
+async def test_mentions_case_insensitive_lowercase_mention(aclient: AsyncClient) -> None:
     """@alice mention is found for user with username 'Alice' (case-insensitive)."""
-    alice_id = _create_user(client, "Alice", "Alice Real")
-    bob_id = _create_user(client, "bob", "Bob")
+    alice_id = await create_user(aclient, "Alice", "Alice Real")
+    bob_id = await create_user(aclient, "bob", "Bob")
 
     # Mention uses lowercase
-    tweet_id = _create_tweet(client, bob_id, "shoutout to @alice today")
+    tweet_id = await create_tweet(aclient, bob_id, "shoutout to @alice today")
 
-    r = client.get(f"/users/{alice_id}/mentions")
+    r = await aclient.get(f"/users/{alice_id}/mentions")
     assert r.status_code == 200
     ids = [t["id"] for t in r.json()]
     assert tweet_id in ids
 
 
-def test_mentions_case_insensitive_uppercase_mention(client: TestClient) -> None:
+async def test_mentions_case_insensitive_uppercase_mention(aclient: AsyncClient) -> None:
     """@ALICE mention is found for user with lowercase username 'alice'."""
-    alice_id = _create_user(client, "alice", "Alice")
-    bob_id = _create_user(client, "bob", "Bob")
+    alice_id = await create_user(aclient, "alice", "Alice")
+    bob_id = await create_user(aclient, "bob", "Bob")
 
-    tweet_id = _create_tweet(client, bob_id, "Hello @ALICE!")
+    tweet_id = await create_tweet(aclient, bob_id, "Hello @ALICE!")
 
-    r = client.get(f"/users/{alice_id}/mentions")
+    r = await aclient.get(f"/users/{alice_id}/mentions")
     assert r.status_code == 200
     ids = [t["id"] for t in r.json()]
     assert tweet_id in ids
 
 
-def test_mentions_multiple_tweets_all_returned(client: TestClient) -> None:
+async def test_mentions_multiple_tweets_all_returned(aclient: AsyncClient) -> None:
     """All tweets mentioning a user are returned, not just the most recent."""
-    alice_id = _create_user(client, "alice", "Alice")
-    bob_id = _create_user(client, "bob", "Bob")
-    carol_id = _create_user(client, "carol", "Carol")
+    alice_id = await create_user(aclient, "alice", "Alice")
+    bob_id = await create_user(aclient, "bob", "Bob")
+    carol_id = await create_user(aclient, "carol", "Carol")
 
-    t1 = _create_tweet(client, bob_id, "First mention @alice")
-    t2 = _create_tweet(client, carol_id, "Second mention @alice")
-    t3 = _create_tweet(client, bob_id, "Third mention @alice too")
+    t1 = await create_tweet(aclient, bob_id, "First mention @alice")
+    t2 = await create_tweet(aclient, carol_id, "Second mention @alice")
+    t3 = await create_tweet(aclient, bob_id, "Third mention @alice too")
 
-    r = client.get(f"/users/{alice_id}/mentions")
+    r = await aclient.get(f"/users/{alice_id}/mentions")
     assert r.status_code == 200
     ids = [t["id"] for t in r.json()]
     assert t1 in ids
@@ -114,31 +102,56 @@ def test_mentions_multiple_tweets_all_returned(client: TestClient) -> None:
     assert t3 in ids
 
 
-def test_mentions_sorted_newest_first(client: TestClient) -> None:
+async def test_mentions_sorted_newest_first(aclient: AsyncClient) -> None:
     """Mentions are returned newest-first."""
-    alice_id = _create_user(client, "alice", "Alice")
-    bob_id = _create_user(client, "bob", "Bob")
+    alice_id = await create_user(aclient, "alice", "Alice")
+    bob_id = await create_user(aclient, "bob", "Bob")
 
-    t1 = _create_tweet(client, bob_id, "First @alice mention")
-    t2 = _create_tweet(client, bob_id, "Second @alice mention")
-    t3 = _create_tweet(client, bob_id, "Third @alice mention")
+    t1 = await create_tweet(aclient, bob_id, "First @alice mention")
+    t2 = await create_tweet(aclient, bob_id, "Second @alice mention")
+    t3 = await create_tweet(aclient, bob_id, "Third @alice mention")
 
-    r = client.get(f"/users/{alice_id}/mentions")
+    r = await aclient.get(f"/users/{alice_id}/mentions")
     assert r.status_code == 200
     ids = [t["id"] for t in r.json()]
     assert ids.index(t3) < ids.index(t2) < ids.index(t1)
 
 
-def test_mentions_does_not_include_non_mentioned_tweets(client: TestClient) -> None:
+async def test_mentions_does_not_include_non_mentioned_tweets(aclient: AsyncClient) -> None:
     """Tweets that don't mention the user are excluded from results."""
-    alice_id = _create_user(client, "alice", "Alice")
-    bob_id = _create_user(client, "bob", "Bob")
+    alice_id = await create_user(aclient, "alice", "Alice")
+    bob_id = await create_user(aclient, "bob", "Bob")
 
-    mention_tweet_id = _create_tweet(client, bob_id, "Hey @alice!")
-    unrelated_tweet_id = _create_tweet(client, bob_id, "Nothing personal here")
+    mention_tweet_id = await create_tweet(aclient, bob_id, "Hey @alice!")
+    unrelated_tweet_id = await create_tweet(aclient, bob_id, "Nothing personal here")
 
-    r = client.get(f"/users/{alice_id}/mentions")
+    r = await aclient.get(f"/users/{alice_id}/mentions")
     assert r.status_code == 200
     ids = [t["id"] for t in r.json()]
     assert mention_tweet_id in ids
     assert unrelated_tweet_id not in ids
+
+
+async def test_mentions_excludes_deleted_tweets(aclient: AsyncClient) -> None:
+    """A deleted tweet no longer appears in the mentioned user's list."""
+    alice_id = await create_user(aclient, "alice", "Alice")
+    bob_id = await create_user(aclient, "bob", "Bob")
+
+    tweet_id = await create_tweet(aclient, bob_id, "Hey @alice!")
+    await aclient.delete(f"/tweets/{tweet_id}")
+
+    r = await aclient.get(f"/users/{alice_id}/mentions")
+    assert r.status_code == 200
+    assert r.json() == []
+
+
+async def test_mentions_mixed_case_duplicates_returned_once(aclient: AsyncClient) -> None:
+    """A tweet mentioning @Alice and @alice is returned only once."""
+    alice_id = await create_user(aclient, "alice", "Alice")
+    bob_id = await create_user(aclient, "bob", "Bob")
+
+    tweet_id = await create_tweet(aclient, bob_id, "@Alice or is it @alice?")
+
+    r = await aclient.get(f"/users/{alice_id}/mentions")
+    assert r.status_code == 200
+    assert [t["id"] for t in r.json()] == [tweet_id]
@@ -5,212 +5,224 @@ Tests POST /tweets/{id}/retweet and POST /tweets/{id}/quote
 from __future__ import annotations
 
 import pytest
-from fastapi.testclient import TestClient
+from httpx import AsyncClient
 
+from twitter_app.tests.factories import create_tweet, create_user
 
-# ── Helpers ──────────────────────────────────────────────────────────────────
-
-
-def _create_user(client: TestClient, username: str = "alice", display_name: str = "Alice") -> dict:
-    r = client.post("/users", json={"username": username, "display_name": display_name})
-    assert r.status_code == 201, r.text
-    return r.json()
-
-
-def _create_tweet(client: TestClient, user_id: str, content: str = "Original tweet") -> dict:
-    r = client.post("/tweets", json={"user_id": user_id, "content": content})
-    assert r.status_code == 201, r.text
-    return r.json()
+# Every test here is a coroutine driven by anyio's pytest plugin
+pytestmark = pytest.mark.anyio
 
 
 # ── Tests ─────────────────────────────────────────────────────────────────────
 
 
 class TestRetweet:
-    def test_retweet_returns_201(self, client: TestClient) -> None:
+    async def test_retweet_returns_201(self, aclient: AsyncClient) -> None:
         """POST /tweets/{id}/retweet returns 201."""
-        author = _create_user(client, "author", "Author")
-        retweeter = _create_user(client, "retweeter", "Retweeter")
-        tweet = _create_tweet(client, author["id"])
-        r = client.post(
-            f"/tweets/{tweet['id']}/retweet",
-            json={"user_id": retweeter["id"]},
+        author_id = await create_user(aclient, "author", "Author")
+        retweeter_id = await create_user(aclient, "retweeter", "Retweeter")
+        tweet_id = await create_tweet(aclient, author_id)
+        r = await aclient.post(
+            f"/tweets/{tweet_id}/retweet",
+            json={"user_id": retweeter_id},
         )
         assert r.status_code == 201
 
-    def test_retweet_type_is_retweet(self, client: TestClient) -> None:
+    async def test_retweet_type_is_retweet(self, aclient: AsyncClient) -> None:
         """Retweet response has type='retweet'."""
-        author = _create_user(client, "author", "Author")
-        retweeter = _create_user(client, "retweeter", "Retweeter")
-        tweet = _create_tweet(client, author["id"])
-        r = client.post(
-            f"/tweets/{tweet['id']}/retweet",
-            json={"user_id": retweeter["id"]},
+        author_id = await create_user(aclient, "author", "Author")
+        retweeter_id = await create_user(aclient, "retweeter", "Retweeter")
+        tweet_id = await create_tweet(aclient, author_id)
+        r = await aclient.post(
+            f"/tweets/{tweet_id}/retweet",
+            json={"user_id": retweeter_id},
         )
         data = r.json()
         assert data["type"] == "retweet"
 
-    def test_retweet_content_is_none(self, client: TestClient) -> None:
+    async def test_retweet_content_is_none(self, aclient: AsyncClient) -> None:
         """Pure retweet has content=None."""
-        author = _create_user(client, "author", "Author")
-        retweeter = _create_user(client, "retweeter", "Retweeter")
-        tweet = _create_tweet(client, author["id"])
-        r = client.post(
-            f"/tweets/{tweet['id']}/retweet",
-            json={"user_id": retweeter["id"]},
+        author_id = await create_user(aclient, "author", "Author")
+        retweeter_id = await create_user(aclient, "retweeter", "Retweeter")
+        tweet_id = await create_tweet(aclient, author_id)
+        r = await aclient.post(
+            f"/tweets/{tweet_id}/retweet",
+            json={"user_id": retweeter_id},
         )
         assert r.json()["content"] is None
 
-    def test_retweet_original_tweet_id_set(self, client: TestClient) -> None:
+    async def test_retweet_original_tweet_id_set(self, aclient: AsyncClient) -> None:
         """Retweet response has original_tweet_id pointing to the source tweet."""
-        author = _create_user(client, "author", "Author")
-        retweeter = _create_user(client, "retweeter", "Retweeter")
-        tweet = _create_tweet(client, author["id"])
-        r = client.post(
-            f"/tweets/{tweet['id']}/retweet",
-            json={"user_id": retweeter["id"]},
+        author_id = await create_user(aclient, "author", "Author")
+        retweeter_id = await create_user(aclient, "retweeter", "Retweeter")
+        tweet_id = await create_tweet(aclient, author_id)
+        r = await aclient.post(
+            f"/tweets/{tweet_id}/retweet",
+            json={"user_id": retweeter_id},
         )
-        assert r.json()["original_tweet_id"] == tweet["id"]
+        assert r.json()["original_tweet_id"] == tweet_id
 
-    def test_retweet_nonexistent_tweet_404(self, client: TestClient) -> None:
+    async def test_retweet_nonexistent_tweet_404(self, aclient: AsyncClient) -> None:
         """POST /tweets/bad-id/retweet returns 404 when tweet does not exist."""
-        user = _create_user(client)
-        r = client.post("/tweets/nonexistent-tweet/retweet", json={"user_id": user["id"]})
+        user_id = await create_user(aclient)
+        r = await aclient.post("/tweets/nonexistent-tweet/retweet", json={"user_id": user_id})
         assert r.status_code == 404
 
-    def test_retweet_nonexistent_user_404(self, client: TestClient) -> None:
+    async def test_retweet_nonexistent_user_404(self, aclient: AsyncClient) -> None:
         """POST /tweets/{id}/retweet returns 404 when the retweeting user does not exist."""
-        author = _create_user(client, "author", "Author")
-        tweet = _create_tweet(client, author["id"])
-        r = client.post(
-            f"/tweets/{tweet['id']}/retweet",
+        author_id = await create_user(aclient, "author", "Author")
+        tweet_id = await create_tweet(aclient, author_id)
+        r = await aclient.post(
+            f"/tweets/{tweet_id}/retweet",
             json={"user_id": "nonexistent-user-id"},
         )
         assert r.status_code == 404
 
-    def test_retweet_increments_retweet_count(self, client: TestClient) -> None:
+    async def test_retweet_increments_retweet_count(self, aclient: AsyncClient) -> None:
         """Original tweet's retweet_count increases after a retweet."""
-        author = _create_user(client, "author", "Author")
-        retweeter = _create_user(client, "retweeter", "Retweeter")
-        tweet = _create_tweet(client, author["id"], "Viral content")
-        client.post(
-            f"/tweets/{tweet['id']}/retweet",
-            json={"user_id": retweeter["id"]},
+        author_id = await create_user(aclient, "author", "Author")
+        retweeter_id = await create_user(aclient, "retweeter", "Retweeter")
+        tweet_id = await create_tweet(aclient, author_id, "Viral content")
+        await aclient.post(
+            f"/tweets/{tweet_id}/retweet",
+            json={"user_id": retweeter_id},
         )
-        r = client.get(f"/tweets/{tweet['id']}")
+        r = await aclient.get(f"/tweets/{tweet_id}")
         assert r.json()["retweet_count"] == 1
 
-    def test_multiple_retweets_count_correctly(self, client: TestClient) -> None:
+    async def test_multiple_retweets_count_correctly(self, aclient: AsyncClient) -> None:
         """retweet_count reflects the correct number of retweets."""
-        author = _create_user(client, "author", "Author")
-        rt1 = _create_user(client, "rt1", "RT One")
-        rt2 = _create_user(client, "rt2", "RT Two")
-        tweet = _create_tweet(client, author["id"])
-        client.post(f"/tweets/{tweet['id']}/retweet", json={"user_id": rt1["id"]})
-        client.post(f"/tweets/{tweet['id']}/retweet", json={"user_id": rt2["id"]})
-        r = client.get(f"/tweets/{tweet['id']}")
+        author_id = await create_user(aclient, "author", "Author")
+        rt1_id = await create_user(aclient, "rt1", "RT One")
+        rt2_id = await create_user(aclient, "rt2", "RT Two")
+        tweet_id = await create_tweet(aclient, author_id)
+        await aclient.post(f"/tweets/{tweet_id}/retweet", json={"user_id": rt1_id})
+        await aclient.post(f"/tweets/{tweet_id}/retweet", json={"user_id": rt2_id})
+        r = await aclient.get(f"/tweets/{tweet_id}")
         assert r.json()["retweet_count"] == 2
 
+    async def test_retweet_increments_retweeter_tweet_count(self, aclient: AsyncClient) -> None:
+        """A retweet counts towards the retweeting user's tweet_count."""
+        author_id = await create_user(aclient, "author", "Author")
+        retweeter_id = await create_user(aclient, "retweeter", "Retweeter")
+        tweet_id = await create_tweet(aclient, author_id)
+        await aclient.post(f"/tweets/{tweet_id}/retweet", json={"user_id": retweeter_id})
+        r = await aclient.get(f"/users/{retweeter_id}")
+        assert r.json()["tweet_count"] == 1
+
+    async def test_delete_retweet_decrements_retweet_count(self, aclient: AsyncClient) -> None:
+        """Deleting a retweet decrements the original tweet's retweet_count."""
+        author_id = await create_user(aclient, "author", "Author")
+        retweeter_id = await create_user(aclient, "retweeter", "Retweeter")
+        tweet_id = await create_tweet(aclient, author_id)
+        rt = (await aclient.post(
+            f"/tweets/{tweet_id}/retweet",
+            json={"user_id": retweeter_id},
+        )).json()
+        await aclient.delete(f"/tweets/{rt['id']}")
+        r = await aclient.get(f"/tweets/{tweet_id}")
+        assert r.json()["retweet_count"] == 0
+
 
 class TestQuoteTweet:
-    def test_quote_returns_201(self, client: TestClient) -> None:
+    async def test_quote_returns_201(self, aclient: AsyncClient) -> None:
         """POST /tweets/{id}/quote returns 201."""
-        author = _create_user(client, "author", "Author")
-        quoter = _create_user(client, "quoter", "Quoter")
-        tweet = _create_tweet(client, author["id"])
-        r = client.post(
-            f"/tweets/{tweet['id']}/quote",
-            json={"user_id": quoter["id"], "content": "My commentary"},
+        author_id = await create_user(aclient, "author", "Author")
+        quoter_id = await create_user(aclient, "quoter", "Quoter")
+        tweet_id = await create_tweet(aclient, author_id)
+        r = await aclient.post(
+            f"/tweets/{tweet_id}/quote",
+            json={"user_id": quoter_id, "content": "My commentary"},
         )
         assert r.status_code == 201
 
-    def test_quote_type_is_quote(self, client: TestClient) -> None:
+    async def test_quote_type_is_quote(self, aclient: AsyncClient) -> None:
         """Quote tweet response has type='quote'."""
-        author = _create_user(client, "author", "Author")
-        quoter = _create_user(client, "quoter", "Quoter")
-        tweet = _create_tweet(client, author["id"])
-        r = client.post(
-            f"/tweets/{tweet['id']}/quote",
-            json={"user_id": quoter["id"], "content": "My commentary"},
+        author_id = await create_user(aclient, "author", "Author")
+        quoter_id = await create_user(aclient, "quoter", "Quoter")
+        tweet_id = await create_tweet(aclient, author_id)
+        r = await aclient.post(
+            f"/tweets/{tweet_id}/quote",
+            json={"user_id": quoter_id, "content": "My commentary"},
         )
         assert r.json()["type"] == "quote"
 
-    def test_quote_content_is_set(self, client: TestClient) -> None:
+    async def test_quote_content_is_set(self, aclient: AsyncClient) -> None:
         """Quote tweet response carries the provided content."""
-        author = _create_user(client, "author", "Author")
-        quoter = _create_user(client, "quoter", "Quoter")
-        tweet = _create_tweet(client, author["id"])
-        r = client.post(
-            f"/tweets/{tweet['id']}/quote",
-            json={"user_id": quoter["id"], "content": "Great insight!"},
+        author_id = await create_user(aclient, "author", "Author")
+        quoter_id = await create_user(aclient, "quoter", "Quoter")
+        tweet_id = await create_tweet(aclient, author_id)
+        r = await aclient.post(
+            f"/tweets/{tweet_id}/quote",
+            json={"user_id": quoter_id, "content": "Great insight!"},
         )
         assert r.json()["content"] == "Great insight!"
 
-    def test_quote_original_tweet_id_set(self, client: TestClient) -> None:
+    async def test_quote_original_tweet_id_set(self, aclient: AsyncClient) -> None:
         """Quote tweet has original_tweet_id pointing to the source tweet."""
-        author = _create_user(client, "author", "Author")
-        quoter = _create_user(client, "quoter", "Quoter")
-        tweet = _create_tweet(client, author["id"])
-        r = client.post(
-            f"/tweets/{tweet['id']}/quote",
-            json={"user_id": quoter["id"], "content": "Commentary"},
+        author_id = await create_user(aclient, "author", "Author")
+        quoter_id = await create_user(aclient, "quoter", "Quoter")
+        tweet_id = await create_tweet(aclient, author_id)
+        r = await aclient.post(
+            f"/tweets/{tweet_id}/quote",
+            json={"user_id": quoter_id, "content": "Commentary"},
         )
-        assert r.json()["original_tweet_id"] == tweet["id"]
+        assert r.json()["original_tweet_id"] == tweet_id
 
-    def test_quote_increments_quote_count(self, client: TestClient) -> None:
+    async def test_quote_increments_quote_count(self, aclient: AsyncClient) -> None:
         """Original tweet's quote_count increases after a quote tweet."""
-        author = _create_user(client, "author", "Author")
-        quoter = _create_user(client, "quoter", "Quoter")
-        tweet = _create_tweet(client, author["id"])
-        client.post(
-            f"/tweets/{tweet['id']}/quote",
-            json={"user_id": quoter["id"], "content": "Good one"},
+        author_id = await create_user(aclient, "author", "Author")
+        quoter_id = await create_user(aclient, "quoter", "Quoter")
+        tweet_id = await create_tweet(aclient, author_id)
+        await aclient.post(
+            f"/tweets/{tweet_id}/quote",
+            json={"user_id": quoter_id, "content": "Good one"},
         )
-        r = client.get(f"/tweets/{tweet['id']}")
+        r = await aclient.get(f"/tweets/{tweet_id}")
         assert r.json()["quote_count"] == 1
 
-    def test_quote_content_over_280_chars(self, client: TestClient) -> None:
+    async def test_quote_content_over_280_chars(self, aclient: AsyncClient) -> None:
         """POST /tweets/{id}/quote with content > 280 chars returns 400 or 422."""
-        author = _create_user(client, "author", "Author")
-        quoter = _create_user(client, "quoter", "Quoter")
-        tweet = _create_tweet(client, author["id"])
+        author_id = await create_user(aclient, "author", "Author")
+        quoter_id = await create_user(aclient, "quoter", "Quoter")
+        tweet_id = await create_tweet(aclient, author_id)
         long_content = "q" * 281
-        r = client.post(
-            f"/tweets/{tweet['id']}/quote",
-            json={"user_id": quoter["id"], "content": long_content},
+        r = await aclient.post(
+            f"/tweets/{tweet_id}/quote",
+            json={"user_id": quoter_id, "content": long_content},
         )
         assert r.status_code in (400, 422)
 
-    def test_quote_nonexistent_tweet_404(self, client: TestClient) -> None:
+    async def test_quote_nonexistent_tweet_404(self, aclient: AsyncClient) -> None:
         """POST /tweets/bad-id/quote returns 404 when original tweet does not exist."""
-        user = _create_user(client)
-        r = client.post(
+        user_id = await create_user(aclient)
+        r = await aclient.post(
             "/tweets/nonexistent-tweet/quote",
-            json={"user_id": user["id"], "content": "Commentary"},
+            json={"user_id": user_id, "content": "Commentary"},
         )
         assert r.status_code == 404
 
-    def test_quote_nonexistent_user_404(self, client: TestClient) -> None:
+    async def test_quote_nonexistent_user_404(self, aclient: AsyncClient) -> None:
         """POST /tweets/{id}/quote returns 404 when the quoting user does not exist."""
-        author = _create_user(client, "author", "Author")
-        tweet = _create_tweet(client, author["id"])
-        r = client.post(
-            f"/tweets/{tweet['id']}/quote",
+        author_id = await create_user(aclient, "author", "Author")
+        tweet_id = await create_tweet(aclient, author_id)
+        r = await aclient.post(
+            f"/tweets/{tweet_id}/quote",
             json={"user_id": "ghost-user-id", "content": "My comment"},
         )
         assert r.status_code == 404
 
-    def test_retweet_and_quote_counts_are_independent(self, client: TestClient) -> None:
+    async def test_retweet_and_quote_counts_are_independent(self, aclient: AsyncClient) -> None:
         """retweet_count and quote_count track separately."""
-        author = _create_user(client, "author", "Author")
-        rt = _create_user(client, "rt", "Retweeter")
-        qt = _create_user(client, "qt", "Quoter")
-        tweet = _create_tweet(client, author["id"])
-        client.post(f"/tweets/{tweet['id']}/retweet", json={"user_id": rt["id"]})
-        client.post(
-            f"/tweets/{tweet['id']}/quote",
-            json={"user_id": qt["id"], "content": "Commentary"},
+        author_id = await create_user(aclient, "author", "Author")
+        rt_id = await create_user(aclient, "rt", "Retweeter")
+        qt_id = await create_user(aclient, "qt", "Quoter")
+        tweet_id = await create_tweet(aclient, author_id)
+        await aclient.post(f"/tweets/{tweet_id}/retweet", json={"user_id": rt_id})
+        await aclient.post(
+            f"/tweets/{tweet_id}/quote",
+            json={"user_id": qt_id, "content": "Commentary"},
         )
-        data = client.get(f"/tweets/{tweet['id']}").json()
+        data = (await aclient.get(f"/tweets/{tweet_id}")).json()
         assert data["retweet_count"] == 1
         assert data["quote_count"] == 1
@@ -8,6 +8,7 @@ Covers:
   - Timeline includes retweets from followed users
   - Timeline includes quote tweets from followed users
   - 404 for nonexistent user
+  - ETag / If-None-Match: 304 while unchanged, 200 with a new ETag after a like
 """
 
 from __future__ import annotations
@@ -15,154 +16,207 @@ from __future__ import annotations
 import time
 
 import pytest
-from fastapi.testclient import TestClient
+from httpx import AsyncClient
 
+from twitter_app.tests.factories import create_tweet, create_user, follow_user
 
-# ── Helpers ─────────────────────────────────────────────────────────────────
-
-
-def _create_user(client: TestClient, username: str, display_name: str) -> str:
-    """Create a user and return their ID."""
-    r = client.post("/users", json={"username": username, "display_name": display_name})
-    assert r.status_code == 201
-    return r.json()["id"]
-
-
-def _create_tweet(client: TestClient, user_id: str, content: str) -> str:
-    """Create a tweet and return its ID."""
-    r = client.post("/tweets", json={"user_id": user_id, "content": content})
-    assert r.status_code == 201
-    return r.json()["id"]
-
-
-def _follow(client: TestClient, follower_id: str, target_id: str) -> None:
-    """Have follower_id follow target_id."""
-    r = client.post(f"/users/{follower_id}/follow", json={"target_user_id": target_id})
-    assert r.status_code == 200
+# Every test here is a coroutine driven by anyio's pytest plugin
+pytestmark = pytest.mark.anyio
 
 
 # ── Tests ────────────────────────────────────────────────────────────────────
 
 
-def test_timeline_returns_tweets_from_followed_users(client: TestClient) -> None:
+async def test_timeline_returns_tweets_from_followed_users(aclient: AsyncClient) -> None:
     """GET /users/{id}/timeline returns tweets authored by users that user follows."""
-    alice_id = _create_user(client, "alice", "Alice")
-    bob_id = _create_user(client, "bob", "Bob")
-    _follow(client, alice_id, bob_id)
+    alice_id = await create_user(aclient, "alice", "Alice")
+    bob_id = await create_user(aclient, "bob", "Bob")
+    await follow_user(aclient, alice_id, bob_id)
 
-    tweet_id = _create_tweet(client, bob_id, "Hello from Bob!")
+    tweet_id = await create_tweet(aclient, bob_id, "Hello from Bob!")
 
-    r = client.get(f"/users/{alice_id}/timeline")
+    r = await aclient.get(f"/users/{alice_id}/timeline")
     assert r.status_code == 200
     ids = [t["id"] for t in r.json()]
     assert tweet_id in ids
 
 
-def test_timeline_is_empty_when_following_nobody(client: TestClient) -> None:
+async def test_timeline_is_empty_when_following_nobody(aclient: AsyncClient) -> None:
     """GET /users/{id}/timeline returns [] when user follows nobody."""
-    alice_id = _create_user(client, "alice", "Alice")
+    alice_id = await create_user(aclient, "alice", "Alice")
     # Create a tweet (shouldn't show up since no follows)
-    _create_tweet(client, alice_id, "My own tweet")
+    await create_tweet(aclient, alice_id, "My own tweet")
 
-    r = client.get(f"/users/{alice_id}/timeline")
+    r = await aclient.get(f"/users/{alice_id}/timeline")
     assert r.status_code == 200
     assert r.json() == []
 
 
-def test_timeline_excludes_own_tweets(client: TestClient) -> None:
+async def test_timeline_excludes_own_tweets(aclient: AsyncClient) -> None:
     """The user's own tweets must NOT appear in their timeline."""
-    alice_id = _create_user(client, "alice", "Alice")
-    bob_id = _create_user(client, "bob", "Bob")
-    _follow(client, alice_id, bob_id)
+    alice_id = await create_user(aclient, "alice", "Alice")
+    bob_id = await create_user(aclient, "bob", "Bob")
+    await follow_user(aclient, alice_id, bob_id)
 
     # Alice tweets — should NOT appear in her own timeline
-    own_tweet_id = _create_tweet(client, alice_id, "Alice's own tweet")
+    own_tweet_id = await create_tweet(aclient, alice_id, "Alice's own tweet")
     # Bob tweets — SHOULD appear
-    bob_tweet_id = _create_tweet(client, bob_id, "Bob's tweet")
+    bob_tweet_id = await create_tweet(aclient, bob_id, "Bob's tweet")
 
-    r = client.get(f"/users/{alice_id}/timeline")
+    r = await aclient.get(f"/users/{alice_id}/timeline")
     assert r.status_code == 200
     ids = [t["id"] for t in r.json()]
     assert own_tweet_id not in ids
     assert bob_tweet_id in ids
 
 
-def test_timeline_sorted_newest_first(client: TestClient) -> None:
+async def test_timeline_sorted_newest_first(aclient: AsyncClient) -> None:
     """Tweets in timeline are ordered newest-first."""
-    alice_id = _create_user(client, "alice", "Alice")
-    bob_id = _create_user(client, "bob", "Bob")
-    _follow(client, alice_id, bob_id)
+    alice_id = await create_user(aclient, "alice", "Alice")
+    bob_id = await create_user(aclient, "bob", "Bob")
+    await follow_user(aclient, alice_id, bob_id)
 
-    tweet1_id = _create_tweet(client, bob_id, "Tweet one")
-    tweet2_id = _create_tweet(client, bob_id, "Tweet two")
-    tweet3_id = _create_tweet(client, bob_id, "Tweet three")
+    tweet1_id = await create_tweet(aclient, bob_id, "Tweet one")
+    tweet2_id = await create_tweet(aclient, bob_id, "Tweet two")
+    tweet3_id = await create_tweet(aclient, bob_id, "Tweet three")
 
-    r = client.get(f"/users/{alice_id}/timeline")
+    r = await aclient.get(f"/users/{alice_id}/timeline")
     assert r.status_code == 200
     ids = [t["id"] for t in r.json()]
     # Most recently created tweet should appear first
     assert ids.index(tweet3_id) < ids.index(tweet2_id) < ids.index(tweet1_id)
 
 
-def test_timeline_includes_retweets_from_followed_users(client: TestClient) -> None:
+async def test_timeline_includes_retweets_from_followed_users(aclient: AsyncClient) -> None:
     """Retweets made by followed users appear in the timeline."""
-    alice_id = _create_user(client, "alice", "Alice")
-    bob_id = _create_user(client, "bob", "Bob")
-    carol_id = _create_user(client, "carol", "Carol")
-    _follow(client, alice_id, bob_id)
+    alice_id = await create_user(aclient, "alice", "Alice")
+    bob_id = await create_user(aclient, "bob", "Bob")
+    carol_id = await create_user(aclient, "carol", "Carol")
+    await follow_user(aclient, alice_id, bob_id)
 
     # Carol posts original; Bob retweets it
-    original_tweet_id = _create_tweet(client, carol_id, "Carol's original")
-    r = client.post(f"/tweets/{original_tweet_id}/retweet", json={"user_id": bob_id})
+    original_tweet_id = await create_tweet(aclient, carol_id, "Carol's original")
+    r = await aclient.post(f"/tweets/{original_tweet_id}/retweet", json={"user_id": bob_id})
     assert r.status_code == 201
     retweet_id = r.json()["id"]
 
-    r = client.get(f"/users/{alice_id}/timeline")
+    r = await aclient.get(f"/users/{alice_id}/timeline")
     assert r.status_code == 200
     ids = [t["id"] for t in r.json()]
     assert retweet_id in ids
 
 
-def test_timeline_includes_quote_tweets_from_followed_users(client: TestClient) -> None:
+async def test_timeline_includes_quote_tweets_from_followed_users(aclient: AsyncClient) -> None:
     """Quote tweets made by followed users appear in the timeline."""
-    alice_id = _create_user(client, "alice", "Alice")
-    bob_id = _create_user(client, "bob", "Bob")
-    carol_id = _create_user(client, "carol", "Carol")
-    _follow(client, alice_id, bob_id)
+    alice_id = await create_user(aclient, "alice", "Alice")
+    bob_id = await create_user(aclient, "bob", "Bob")
+    carol_id = await create_user(aclient, "carol", "Carol")
+    await follow_user(aclient, alice_id, bob_id)
 
-    original_tweet_id = _create_tweet(client, carol_id, "Carol's original")
-    r = client.post(
+    original_tweet_id = await create_tweet(aclient, carol_id, "Carol's original")
+    r = await aclient.post(
         f"/tweets/{original_tweet_id}/quote",
         json={"user_id": bob_id, "content": "Bob's commentary"},
     )
     assert r.status_code == 201
     quote_id = r.json()["id"]
 
-    r = client.get(f"/users/{alice_id}/timeline")
+    r = await aclient.get(f"/users/{alice_id}/timeline")
     assert r.status_code == 200
     ids = [t["id"] for t in r.json()]
     assert quote_id in ids
 
 
-def test_timeline_nonexistent_user_returns_404(client: TestClient) -> None:
+async def test_timeline_nonexistent_user_returns_404(aclient: AsyncClient) -> None:
     """GET /users/{id}/timeline with a non-existent user_id returns 404."""
-    r = client.get("/users/does-not-exist/timeline")
+    r = await aclient.get("/users/does-not-exist/timeline")
     assert r.status_code == 404
 
 
-def test_timeline_aggregates_multiple_followed_users(client: TestClient) -> None:
+async def test_timeline_aggregates_multiple_followed_users(aclient: AsyncClient) -> None:
     """Timeline includes tweets from ALL followed users."""
-    alice_id = _create_user(client, "alice", "Alice")
-    bob_id = _create_user(client, "bob", "Bob")
-    carol_id = _create_user(client, "carol", "Carol")
-    _follow(client, alice_id, bob_id)
-    _follow(client, alice_id, carol_id)
+    alice_id = await create_user(aclient, "alice", "Alice")
+    bob_id = await create_user(aclient, "bob", "Bob")
+    carol_id = await create_user(aclient, "carol", "Carol")
+    await follow_user(aclient, alice_id, bob_id)
+    await follow_user(aclient, alice_id, carol_id)
 
-    bob_tweet_id = _create_tweet(client, bob_id, "Bob speaks")
-    carol_tweet_id = _create_tweet(client, carol_id, "Carol speaks")
+    bob_tweet_id = await create_tweet(aclient, bob_id, "Bob speaks")
+    carol_tweet_id = await create_tweet(aclient, carol_id, "Carol speaks")
 
-    r = client.get(f"/users/{alice_id}/timeline")
+    r = await aclient.get(f"/users/{alice_id}/timeline")
     assert r.status_code == 200
     ids = [t["id"] for t in r.json()]
     assert bob_tweet_id in ids
     assert carol_tweet_id in ids
+
+
+async def test_timeline_embeds_original_for_each_retweet(aclient: AsyncClient) -> None:
+    """Several retweets of the same tweet each embed the full original tweet."""
+    alice_id = await create_user(aclient, "alice", "Alice")
+    bob_id = await create_user(aclient, "bob", "Bob")
+    carol_id = await create_user(aclient, "carol", "Carol")
+    dave_id = await create_user(aclient, "dave", "Dave")
+    await follow_user(aclient, alice_id, bob_id)
+    await follow_user(aclient, alice_id, carol_id)
+
+    original_tweet_id = await create_tweet(aclient, dave_id, "Dave goes viral")
+    for retweeter_id in (bob_id, carol_id):
+        r = await aclient.post(f"/tweets/{original_tweet_id}/retweet", json={"user_id": retweeter_id})
+        assert r.status_code == 201
+
+    r = await aclient.get(f"/users/{alice_id}/timeline")
+    assert r.status_code == 200
+    feed = r.json()
+    assert len(feed) == 2
+    for item in feed:
+        assert item["original_tweet"]["id"] == original_tweet_id
+        assert item["original_tweet"]["retweet_count"] == 2
+        assert item["original_tweet"]["author"]["username"] == "dave"
+
+
+async def test_timeline_reflects_new_tweets_after_cached_read(aclient: AsyncClient) -> None:
+    """A cached timeline is rebuilt once a followed user tweets again."""
+    alice_id = await create_user(aclient, "alice", "Alice")
+    bob_id = await create_user(aclient, "bob", "Bob")
+    await follow_user(aclient, alice_id, bob_id)
+    first_id = await create_tweet(aclient, bob_id, "First")
+
+    r = await aclient.get(f"/users/{alice_id}/timeline")
+    assert [t["id"] for t in r.json()] == [first_id]
+
+    second_id = await create_tweet(aclient, bob_id, "Second")
+
+    r = await aclient.get(f"/users/{alice_id}/timeline")
+    assert [t["id"] for t in r.json()] == [second_id, first_id]
+
+
+async def test_timeline_etag_returns_304_when_unchanged(aclient: AsyncClient) -> None:
+    """A repeated GET with a matching If-None-Match returns 304 and no body."""
+    alice_id = await create_user(aclient, "alice", "Alice")
+    bob_id = await create_user(aclient, "bob", "Bob")
+    await follow_user(aclient, alice_id, bob_id)
+    await create_tweet(aclient, bob_id, "Cached")
+    etag = (await aclient.get(f"/users/{alice_id}/timeline")).headers["etag"]
+
+    r = await aclient.get(f"/users/{alice_id}/timeline", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.headers["etag"] == etag
+    assert r.content == b""
+
+
+async def test_timeline_etag_changes_after_like(aclient: AsyncClient) -> None:
+    """A like bumps storage.version, so the old ETag gets a 200 with fresh counts."""
+    alice_id = await create_user(aclient, "alice", "Alice")
+    bob_id = await create_user(aclient, "bob", "Bob")
+    await follow_user(aclient, alice_id, bob_id)
+    tweet_id = await create_tweet(aclient, bob_id, "Like me")
+    etag = (await aclient.get(f"/users/{alice_id}/timeline")).headers["etag"]
+
+    r = await aclient.post(f"/tweets/{tweet_id}/like", json={"user_id": alice_id})
+    assert r.status_code == 200
+
+    r = await aclient.get(f"/users/{alice_id}/timeline", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+    assert r.json()[0]["like_count"] == 1
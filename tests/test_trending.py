@@ -7,52 +7,40 @@ Covers:
   - Deleted tweets reduce count (and drop hashtag from trending if count hits 0)
   - Maximum 10 items returned even when more hashtags exist
   - TrendingItem shape: {hashtag, count}
+  - ETag / If-None-Match: 304 while unchanged, never across reset_storage()
 """
 
 from __future__ import annotations
 
 import pytest
-from fastapi.testclient import TestClient
+from httpx import AsyncClient
 
+from twitter_app import storage
+from twitter_app.tests.factories import create_tweet, create_user, make_tweets
 
-# ── Helpers ─────────────────────────────────────────────────────────────────
-
-
-def _create_user(client: TestClient, username: str, display_name: str) -> str:
-    """Create a user and return their ID."""
-    r = client.post("/users", json={"username": username, "display_name": display_name})
-    assert r.status_code == 201
-    return r.json()["id"]
-
-
-def _create_tweet(client: TestClient, user_id: str, content: str) -> str:
-    """Create a tweet and return its ID."""
-    r = client.post("/tweets", json={"user_id": user_id, "content": content})
-    assert r.status_code == 201
-    return r.json()["id"]
+# Every test here is a coroutine driven by anyio's pytest plugin
+pytestmark = pytest.mark.anyio
 
 
 # ── Tests ────────────────────────────────────────────────────────────────────
 
 
-def test_trending_returns_empty_when_no_hashtags(client: TestClient) -> None:
+async def test_trending_returns_empty_when_no_hashtags(aclient: AsyncClient) -> None:
     """GET /trending returns [] when no tweets with hashtags exist."""
-    r = client.get("/trending")
+    r = await aclient.get("/trending")
     assert r.status_code == 200
     assert r.json() == []
 
 
-def test_trending_returns_hashtags_descending(client: TestClient) -> None:
+async def test_trending_returns_hashtags_descending(aclient: AsyncClient) -> None:
     """GET /trending returns hashtags sorted by count, highest first."""
-    user_id = _create_user(client, "alice", "Alice")
+    user_id = await create_user(aclient, "alice", "Alice")
     # #popular used 3 times, #medium 2 times, #rare once
-    for i in range(3):
-        _create_tweet(client, user_id, f"Tweet {i} #popular")
-    for i in range(2):
-        _create_tweet(client, user_id, f"Tweet {i} #medium")
-    _create_tweet(client, user_id, "Only one #rare")
+    make_tweets(user_id, [f"Tweet {i} #popular" for i in range(3)])
+    make_tweets(user_id, [f"Tweet {i} #medium" for i in range(2)])
+    make_tweets(user_id, ["Only one #rare"])
 
-    r = client.get("/trending")
+    r = await aclient.get("/trending")
     assert r.status_code == 200
     items = r.json()
 
@@ -69,12 +57,12 @@ def test_trending_returns_hashtags_descending(client: TestClient) -> None:
     assert counts["rare"] == 1
 
 
-def test_trending_response_shape(client: TestClient) -> None:
+async def test_trending_response_shape(aclient: AsyncClient) -> None:
     """Each trending item has 'hashtag' (str) and 'count' (int) fields."""
-    user_id = _create_user(client, "bob", "Bob")
-    _create_tweet(client, user_id, "Hello #shape")
+    user_id = await create_user(aclient, "bob", "Bob")
+    await create_tweet(aclient, user_id, "Hello #shape")
 
-    r = client.get("/trending")
+    r = await aclient.get("/trending")
     assert r.status_code == 200
     items = r.json()
     assert len(items) == 1
@@ -85,62 +73,117 @@ def test_trending_response_shape(client: TestClient) -> None:
     assert isinstance(item["count"], int)
 
 
-def test_trending_respects_deleted_tweets(client: TestClient) -> None:
+async def test_trending_respects_deleted_tweets(aclient: AsyncClient) -> None:
     """A deleted tweet's hashtag is not counted in trending."""
-    user_id = _create_user(client, "carol", "Carol")
+    user_id = await create_user(aclient, "carol", "Carol")
     # Two tweets with #going, then delete one of them
-    t1 = _create_tweet(client, user_id, "Tweet one #going")
-    t2 = _create_tweet(client, user_id, "Tweet two #going")
+    t1 = await create_tweet(aclient, user_id, "Tweet one #going")
+    t2 = await create_tweet(aclient, user_id, "Tweet two #going")
 
-    r = client.get("/trending")
+    r = await aclient.get("/trending")
     assert r.status_code == 200
     counts = {i["hashtag"]: i["count"] for i in r.json()}
     assert counts["going"] == 2
 
     # Delete one tweet
-    client.delete(f"/tweets/{t1}")
+    await aclient.delete(f"/tweets/{t1}")
 
-    r = client.get("/trending")
+    r = await aclient.get("/trending")
     counts = {i["hashtag"]: i["count"] for i in r.json()}
     assert counts["going"] == 1
 
 
-def test_trending_drops_hashtag_when_all_tweets_deleted(client: TestClient) -> None:
+async def test_trending_drops_hashtag_when_all_tweets_deleted(aclient: AsyncClient) -> None:
     """A hashtag disappears from trending entirely when all its tweets are deleted."""
-    user_id = _create_user(client, "dave", "Dave")
-    tweet_id = _create_tweet(client, user_id, "Gone #vanished")
+    user_id = await create_user(aclient, "dave", "Dave")
+    tweet_id = await create_tweet(aclient, user_id, "Gone #vanished")
 
-    r = client.get("/trending")
+    r = await aclient.get("/trending")
     tags = [i["hashtag"] for i in r.json()]
     assert "vanished" in tags
 
-    client.delete(f"/tweets/{tweet_id}")
+    await aclient.delete(f"/tweets/{tweet_id}")
 
-    r = client.get("/trending")
+    r = await aclient.get("/trending")
     tags = [i["hashtag"] for i in r.json()]
     assert "vanished" not in tags
 
 
-def test_trending_max_10_items(client: TestClient) -> None:
+async def test_trending_max_10_items(aclient: AsyncClient) -> None:
     """GET /trending returns at most 10 hashtags even if more exist."""
-    user_id = _create_user(client, "eve", "Eve")
+    user_id = await create_user(aclient, "eve", "Eve")
     # Create 15 unique hashtags, each with 1 tweet
-    for i in range(15):
-        _create_tweet(client, user_id, f"Tweet about #tag{i:02d}")
+    make_tweets(user_id, (f"Tweet about #tag{i:02d}" for i in range(15)))
 
-    r = client.get("/trending")
+    r = await aclient.get("/trending")
     assert r.status_code == 200
     assert len(r.json()) <= 10
 
 
-def test_trending_single_hashtag(client: TestClient) -> None:
+async def test_trending_single_hashtag(aclient: AsyncClient) -> None:
     """GET /trending with exactly one hashtag returns exactly one item."""
-    user_id = _create_user(client, "frank", "Frank")
-    _create_tweet(client, user_id, "Hello #solo")
+    user_id = await create_user(aclient, "frank", "Frank")
+    await create_tweet(aclient, user_id, "Hello #solo")
 
-    r = client.get("/trending")
+    r = await aclient.get("/trending")
     assert r.status_code == 200
     items = r.json()
     assert len(items) == 1
     assert items[0]["hashtag"] == "solo"
     assert items[0]["count"] == 1
+
+
+async def test_trending_etag_returns_304_when_unchanged(aclient: AsyncClient) -> None:
+    """A repeated GET /trending with a matching If-None-Match returns 304."""
+    user_id = await create_user(aclient, "grace", "Grace")
+    await create_tweet(aclient, user_id, "Hello #cached")
+
+    r = await aclient.get("/trending")
+    etag = r.headers["etag"]
+
+    r = await aclient.get("/trending", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+
+
+async def test_trending_etag_changes_after_write(aclient: AsyncClient) -> None:
+    """A hashtag write invalidates the cached trending list and its ETag."""
+    user_id = await create_user(aclient, "heidi", "Heidi")
+    await create_tweet(aclient, user_id, "Hello #fresh")
+    etag = (await aclient.get("/trending")).headers["etag"]
+
+    await create_tweet(aclient, user_id, "Again #fresh")
+
+    r = await aclient.get("/trending", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+    assert r.json() == [{"hashtag": "fresh", "count": 2}]
+
+
+async def test_trending_etag_survives_unrelated_writes(aclient: AsyncClient) -> None:
+    """Likes and tag-less tweets leave the cached trending list (and ETag) valid."""
+    user_id = await create_user(aclient, "ivan", "Ivan")
+    tweet_id = await create_tweet(aclient, user_id, "Steady #calm")
+    etag = (await aclient.get("/trending")).headers["etag"]
+
+    await aclient.post(f"/tweets/{tweet_id}/like", json={"user_id": user_id})
+    await create_tweet(aclient, user_id, "No tags in this one")
+
+    r = await aclient.get("/trending", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+
+
+async def test_trending_etag_does_not_match_after_reset(aclient: AsyncClient) -> None:
+    """An ETag issued before reset_storage() never 304s against post-reset content."""
+    user_id = await create_user(aclient, "judy", "Judy")
+    await create_tweet(aclient, user_id, "Before #x")
+    etag = (await aclient.get("/trending")).headers["etag"]
+
+    # The version counters restart at 0, so the rebuilt payload reaches the same version
+    storage.reset_storage()
+    user_id = await create_user(aclient, "judy", "Judy")
+    await create_tweet(aclient, user_id, "After #y")
+
+    r = await aclient.get("/trending", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+    assert r.json() == [{"hashtag": "y", "count": 1}]
@@ -8,40 +8,26 @@ from __future__ import annotations
 import pytest
 from fastapi.testclient import TestClient
 
-
-# ── Helpers ──────────────────────────────────────────────────────────────────
-
-
-def _create_user(client: TestClient, username: str = "alice", display_name: str = "Alice") -> dict:
-    r = client.post("/users", json={"username": username, "display_name": display_name})
-    assert r.status_code == 201, r.text
-    return r.json()
-
-
-def _create_tweet(client: TestClient, user_id: str, content: str = "Hello world!") -> dict:
-    r = client.post("/tweets", json={"user_id": user_id, "content": content})
-    assert r.status_code == 201, r.text
-    return r.json()
+from twitter_app.routers.tweets import _extract_tokens
+from twitter_app.tests.factories import post_tweet, post_user
 
 
 # ── Tests ─────────────────────────────────────────────────────────────────────
 
 
 class TestCreateTweet:
-    def test_create_tweet_returns_201(self, client: TestClient) -> None:
+    def test_create_tweet_returns_201(self, client: TestClient, author: dict) -> None:
         """POST /tweets with valid data returns 201."""
-        user = _create_user(client)
-        r = client.post("/tweets", json={"user_id": user["id"], "content": "Hello Twitter!"})
+        r = client.post("/tweets", json={"user_id": author["id"], "content": "Hello Twitter!"})
         assert r.status_code == 201
 
-    def test_create_tweet_response_shape(self, client: TestClient) -> None:
+    def test_create_tweet_response_shape(self, client: TestClient, author: dict) -> None:
         """Response contains id, content, user_id, like_count, retweet_count, quote_count."""
-        user = _create_user(client)
-        r = client.post("/tweets", json={"user_id": user["id"], "content": "Test tweet"})
+        r = client.post("/tweets", json={"user_id": author["id"], "content": "Test tweet"})
         data = r.json()
         assert "id" in data
         assert data["content"] == "Test tweet"
-        assert data["user_id"] == user["id"]
+        assert data["user_id"] == author["id"]
         assert data["like_count"] == 0
         assert data["retweet_count"] == 0
         assert data["quote_count"] == 0
@@ -52,76 +38,66 @@ class TestCreateTweet:
         r = client.post("/tweets", json={"user_id": "bad-user-id", "content": "Hello!"})
         assert r.status_code == 404
 
-    def test_create_tweet_content_over_280_chars(self, client: TestClient) -> None:
-        """POST /tweets with content > 280 chars returns 400 or 422."""
-        user = _create_user(client)
-        long_content = "x" * 281
-        r = client.post("/tweets", json={"user_id": user["id"], "content": long_content})
-        assert r.status_code in (400, 422)
-
-    def test_create_tweet_exactly_280_chars_accepted(self, client: TestClient) -> None:
-        """POST /tweets with exactly 280 chars is accepted (boundary value)."""
-        user = _create_user(client)
-        content = "a" * 280
-        r = client.post("/tweets", json={"user_id": user["id"], "content": content})
-        assert r.status_code == 201
-
-    def test_create_tweet_extracts_hashtags(self, client: TestClient) -> None:
+    @pytest.mark.parametrize(
+        "length, expected",
+        [(280, {201}), (281, {400, 422})],
+        ids=["exactly_280_accepted", "over_280_rejected"],
+    )
+    def test_create_tweet_content_length_boundary(
+        self, client: TestClient, author: dict, length: int, expected: set
+    ) -> None:
+        """POST /tweets accepts 280 chars and rejects 281 with 400 or 422."""
+        r = client.post("/tweets", json={"user_id": author["id"], "content": "a" * length})
+        assert r.status_code in expected
+
+    def test_create_tweet_extracts_hashtags(self, client: TestClient, author: dict) -> None:
         """Hashtags are extracted from content and stored as lowercase list."""
-        user = _create_user(client)
         r = client.post(
             "/tweets",
-            json={"user_id": user["id"], "content": "Learning #Python and #Coding today!"},
+            json={"user_id": author["id"], "content": "Learning #Python and #Coding today!"},
         )
         assert r.status_code == 201
         data = r.json()
         assert "python" in data["hashtags"]
         assert "coding" in data["hashtags"]
 
-    def test_create_tweet_extracts_mentions(self, client: TestClient) -> None:
+    def test_create_tweet_extracts_mentions(self, client: TestClient, author: dict) -> None:
         """@mentions are extracted from content and stored in mentions list."""
-        user = _create_user(client)
         r = client.post(
             "/tweets",
-            json={"user_id": user["id"], "content": "Hey @alice and @bob, check this out!"},
+            json={"user_id": author["id"], "content": "Hey @alice and @bob, check this out!"},
         )
         assert r.status_code == 201
         data = r.json()
         assert "alice" in data["mentions"]
         assert "bob" in data["mentions"]
 
-    def test_create_tweet_no_hashtags_or_mentions(self, client: TestClient) -> None:
+    def test_create_tweet_no_hashtags_or_mentions(self, client: TestClient, author: dict) -> None:
         """Tweet with no hashtags or mentions has empty lists."""
-        user = _create_user(client)
-        r = client.post("/tweets", json={"user_id": user["id"], "content": "Plain text tweet."})
+        r = client.post("/tweets", json={"user_id": author["id"], "content": "Plain text tweet."})
         data = r.json()
         assert data["hashtags"] == []
         assert data["mentions"] == []
 
-    def test_create_tweet_type_is_tweet(self, client: TestClient) -> None:
+    def test_create_tweet_type_is_tweet(self, client: TestClient, author: dict) -> None:
         """Original tweets have type='tweet'."""
-        user = _create_user(client)
-        r = client.post("/tweets", json={"user_id": user["id"], "content": "Hello!"})
+        r = client.post("/tweets", json={"user_id": author["id"], "content": "Hello!"})
         assert r.json()["type"] == "tweet"
 
 
 class TestGetTweet:
-    def test_get_tweet_200(self, client: TestClient) -> None:
-        """GET /tweets/{id} returns 200 with correct data."""
-        user = _create_user(client)
-        tweet = _create_tweet(client, user["id"], "Fetch me")
+    def test_get_tweet_200(
+        self, client: TestClient, author: dict, subtests: pytest.Subtests
+    ) -> None:
+        """GET /tweets/{id} returns 200 with the content and all three counts."""
+        tweet = post_tweet(client, author["id"], "Fetch me")
         r = client.get(f"/tweets/{tweet['id']}")
         assert r.status_code == 200
-        assert r.json()["content"] == "Fetch me"
-
-    def test_get_tweet_includes_counts(self, client: TestClient) -> None:
-        """GET /tweets/{id} includes like_count, retweet_count, quote_count."""
-        user = _create_user(client)
-        tweet = _create_tweet(client, user["id"])
-        data = client.get(f"/tweets/{tweet['id']}").json()
-        assert "like_count" in data
-        assert "retweet_count" in data
-        assert "quote_count" in data
+        data = r.json()
+        with subtests.test("content"):
+            assert data["content"] == "Fetch me"
+        with subtests.test("counts"):
+            assert {"like_count", "retweet_count", "quote_count"} <= data.keys()
 
     def test_get_tweet_404(self, client: TestClient) -> None:
         """GET /tweets/{id} returns 404 for a nonexistent tweet ID."""
@@ -130,17 +106,15 @@ class TestGetTweet:
 
 
 class TestDeleteTweet:
-    def test_delete_tweet_204(self, client: TestClient) -> None:
+    def test_delete_tweet_204(self, client: TestClient, author: dict) -> None:
         """DELETE /tweets/{id} returns 204 on success."""
-        user = _create_user(client)
-        tweet = _create_tweet(client, user["id"])
+        tweet = post_tweet(client, author["id"])
         r = client.delete(f"/tweets/{tweet['id']}")
         assert r.status_code == 204
 
-    def test_delete_tweet_removes_from_store(self, client: TestClient) -> None:
+    def test_delete_tweet_removes_from_store(self, client: TestClient, author: dict) -> None:
         """After DELETE, GET /tweets/{id} returns 404."""
-        user = _create_user(client)
-        tweet = _create_tweet(client, user["id"])
+        tweet = post_tweet(client, author["id"])
         client.delete(f"/tweets/{tweet['id']}")
         r = client.get(f"/tweets/{tweet['id']}")
         assert r.status_code == 404
@@ -152,41 +126,65 @@ class TestDeleteTweet:
 
     def test_delete_tweet_decrements_tweet_count(self, client: TestClient) -> None:
         """Deleting a tweet decrements the author's tweet_count."""
-        user = _create_user(client)
-        tweet = _create_tweet(client, user["id"])
+        user = post_user(client)
+        tweet = post_tweet(client, user["id"])
         client.delete(f"/tweets/{tweet['id']}")
         r = client.get(f"/users/{user['id']}")
         assert r.json()["tweet_count"] == 0
 
 
 class TestHashtagAndMentionExtraction:
-    def test_hashtags_deduplication(self, client: TestClient) -> None:
+    def test_hashtags_deduplication(self, client: TestClient, author: dict) -> None:
         """Duplicate hashtags in content appear only once in the list."""
-        user = _create_user(client)
         r = client.post(
             "/tweets",
-            json={"user_id": user["id"], "content": "#python is great, love #python"},
+            json={"user_id": author["id"], "content": "#python is great, love #python"},
         )
         data = r.json()
         assert data["hashtags"].count("python") == 1
 
-    def test_hashtags_case_normalised_to_lowercase(self, client: TestClient) -> None:
+    def test_hashtags_case_normalised_to_lowercase(self, client: TestClient, author: dict) -> None:
         """Hashtags are stored in lowercase regardless of original casing."""
-        user = _create_user(client)
         r = client.post(
             "/tweets",
-            json={"user_id": user["id"], "content": "#Python #CODING"},
+            json={"user_id": author["id"], "content": "#Python #CODING"},
         )
         data = r.json()
         assert "python" in data["hashtags"]
         assert "coding" in data["hashtags"]
 
-    def test_mentions_deduplication(self, client: TestClient) -> None:
+    def test_mentions_deduplication(self, client: TestClient, author: dict) -> None:
         """Duplicate @mentions appear only once."""
-        user = _create_user(client)
         r = client.post(
             "/tweets",
-            json={"user_id": user["id"], "content": "@alice hey @alice!"},
+            json={"user_id": author["id"], "content": "@alice hey @alice!"},
         )
         data = r.json()
         assert data["mentions"].count("alice") == 1
+
+    def test_mentions_case_normalised_to_lowercase(self, client: TestClient, author: dict) -> None:
+        """@mentions are stored in lowercase, so @Bob and @bob collapse to one."""
+        r = client.post(
+            "/tweets",
+            json={"user_id": author["id"], "content": "@Bob meet @bob"},
+        )
+        assert r.json()["mentions"] == ["bob"]
+
+
+class TestExtractTokens:
+    """Direct checks on the write-time tokenizer, without the HTTP layer."""
+
+    def test_content_without_sigils_skips_the_regex(self) -> None:
+        """Content with no '#' or '@' returns two empty lists."""
+        assert _extract_tokens("just words, no tokens") == ([], [])
+
+    def test_tokens_are_interned(self) -> None:
+        """Equal tokens from different tweets are the same string object."""
+        first_tags, first_mentions = _extract_tokens("#Python with @Alice")
+        second_tags, second_mentions = _extract_tokens("more #PYTHON for @alice")
+        assert first_tags[0] is second_tags[0]
+        assert first_mentions[0] is second_mentions[0]
+
+    def test_hashtags_and_mentions_split_in_one_pass(self) -> None:
+        """Mixed content yields each kind in first-seen order."""
+        assert _extract_tokens("@b #x @a #y #x") == (["x", "y"], ["b", "a"])
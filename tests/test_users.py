@@ -4,31 +4,12 @@ Tests POST /users, GET /users/{id}, PUT /users/{id}, GET /users/{id}/tweets
 """
 from __future__ import annotations
 
+from datetime import datetime, timedelta
+
 import pytest
 from fastapi.testclient import TestClient
 
-
-# ── Helpers ──────────────────────────────────────────────────────────────────
-
-
-def _create_user(
-    client: TestClient,
-    username: str = "alice",
-    display_name: str = "Alice",
-    bio: str | None = None,
-) -> dict:
-    payload: dict = {"username": username, "display_name": display_name}
-    if bio is not None:
-        payload["bio"] = bio
-    r = client.post("/users", json=payload)
-    assert r.status_code == 201, r.text
-    return r.json()
-
-
-def _create_tweet(client: TestClient, user_id: str, content: str = "Hello!") -> dict:
-    r = client.post("/tweets", json={"user_id": user_id, "content": content})
-    assert r.status_code == 201, r.text
-    return r.json()
+from twitter_app.tests.factories import make_tweets, post_tweet, post_user
 
 
 # ── Tests ─────────────────────────────────────────────────────────────────────
@@ -65,74 +46,91 @@ class TestCreateUser:
         assert r.status_code == 201
         assert r.json()["bio"] is None
 
+    def test_create_user_created_at_is_utc_aware(self, client: TestClient) -> None:
+        """created_at is an ISO-8601 timestamp with an explicit UTC offset."""
+        user = post_user(client, "chuck", "Chuck")
+        created = datetime.fromisoformat(user["created_at"])
+        assert created.utcoffset() == timedelta(0)
+
     def test_create_user_duplicate_username_409(self, client: TestClient) -> None:
         """POST /users with a duplicate username returns 409."""
-        _create_user(client, "alice")
+        post_user(client, "alice")
         r = client.post("/users", json={"username": "alice", "display_name": "Alice2"})
         assert r.status_code == 409
 
     def test_create_user_duplicate_username_case_insensitive(self, client: TestClient) -> None:
         """Duplicate detection is case-insensitive (ALICE == alice)."""
-        _create_user(client, "alice")
+        post_user(client, "alice")
         r = client.post("/users", json={"username": "ALICE", "display_name": "Alice Upper"})
         assert r.status_code == 409
 
-    def test_create_user_empty_username_422(self, client: TestClient) -> None:
-        """POST /users with empty username returns 422."""
-        r = client.post("/users", json={"username": "", "display_name": "Alice"})
-        assert r.status_code == 422
-
-    def test_create_user_empty_display_name_422(self, client: TestClient) -> None:
-        """POST /users with empty display_name returns 422."""
-        r = client.post("/users", json={"username": "alice", "display_name": ""})
-        assert r.status_code == 422
-
-    def test_create_user_whitespace_username_422(self, client: TestClient) -> None:
-        """Whitespace-only username is treated as empty and rejected with 422."""
-        r = client.post("/users", json={"username": "   ", "display_name": "Alice"})
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"username": "", "display_name": "Alice"},
+            {"username": "alice", "display_name": ""},
+            # Whitespace-only is stripped, then rejected as empty
+            {"username": "   ", "display_name": "Alice"},
+        ],
+        ids=["empty_username", "empty_display_name", "whitespace_username"],
+    )
+    def test_create_user_blank_field_422(self, client: TestClient, payload: dict) -> None:
+        """POST /users with a blank username or display_name returns 422."""
+        r = client.post("/users", json=payload)
         assert r.status_code == 422
 
 
 class TestGetUser:
-    def test_get_user_200(self, client: TestClient) -> None:
-        """GET /users/{id} returns 200 with correct data."""
-        user = _create_user(client, "dave", "Dave")
+    def test_get_user_200(self, client: TestClient, subtests: pytest.Subtests) -> None:
+        """GET /users/{id} returns 200 with the username and a live tweet_count."""
+        user = post_user(client, "dave", "Dave")
+        make_tweets(user["id"], ["Tweet 1", "Tweet 2"])
         r = client.get(f"/users/{user['id']}")
         assert r.status_code == 200
-        assert r.json()["username"] == "dave"
+        data = r.json()
+        with subtests.test("username"):
+            assert data["username"] == "dave"
+        with subtests.test("tweet_count"):
+            assert data["tweet_count"] == 2
 
     def test_get_user_404(self, client: TestClient) -> None:
         """GET /users/{id} returns 404 for a nonexistent ID."""
         r = client.get("/users/nonexistent-user-id")
         assert r.status_code == 404
 
-    def test_get_user_counts_reflect_tweets(self, client: TestClient) -> None:
-        """tweet_count increments when tweets are created."""
-        user = _create_user(client, "eve", "Eve")
-        _create_tweet(client, user["id"], "Tweet 1")
-        _create_tweet(client, user["id"], "Tweet 2")
-        r = client.get(f"/users/{user['id']}")
-        assert r.json()["tweet_count"] == 2
+    def test_get_user_reflects_writes_after_earlier_read(self, client: TestClient) -> None:
+        """A GET after an update, follow or tweet is not served a stale rendering."""
+        user = post_user(client, "erin", "Erin")
+        other = post_user(client, "otto", "Otto")
+        assert client.get(f"/users/{user['id']}").json()["tweet_count"] == 0
+        client.put(f"/users/{user['id']}", json={"display_name": "Erin B"})
+        client.post(f"/users/{other['id']}/follow", json={"target_user_id": user["id"]})
+        post_tweet(client, user["id"], "Fresh")
+        data = client.get(f"/users/{user['id']}").json()
+        assert data["display_name"] == "Erin B"
+        assert data["followers_count"] == 1
+        assert data["tweet_count"] == 1
+        assert client.get(f"/users/{other['id']}").json()["following_count"] == 1
 
 
 class TestUpdateUser:
     def test_update_display_name_200(self, client: TestClient) -> None:
         """PUT /users/{id} with display_name returns 200 and updated value."""
-        user = _create_user(client, "frank", "Frank")
+        user = post_user(client, "frank", "Frank")
         r = client.put(f"/users/{user['id']}", json={"display_name": "Franklin"})
         assert r.status_code == 200
         assert r.json()["display_name"] == "Franklin"
 
     def test_update_bio_200(self, client: TestClient) -> None:
         """PUT /users/{id} with bio returns 200 and updated bio."""
-        user = _create_user(client, "grace", "Grace")
+        user = post_user(client, "grace", "Grace")
         r = client.put(f"/users/{user['id']}", json={"bio": "New bio text"})
         assert r.status_code == 200
         assert r.json()["bio"] == "New bio text"
 
     def test_update_both_fields(self, client: TestClient) -> None:
         """PUT /users/{id} can update display_name and bio in one request."""
-        user = _create_user(client, "heidi", "Heidi")
+        user = post_user(client, "heidi", "Heidi")
         r = client.put(
             f"/users/{user['id']}",
             json={"display_name": "Heidi Updated", "bio": "Updated bio"},
@@ -151,9 +149,8 @@ class TestUpdateUser:
 class TestUserTweets:
     def test_get_user_tweets_200(self, client: TestClient) -> None:
         """GET /users/{id}/tweets returns 200 with all user tweets."""
-        user = _create_user(client, "ivan", "Ivan")
-        _create_tweet(client, user["id"], "First post")
-        _create_tweet(client, user["id"], "Second post")
+        user = post_user(client, "ivan", "Ivan")
+        make_tweets(user["id"], ["First post", "Second post"])
         r = client.get(f"/users/{user['id']}/tweets")
         assert r.status_code == 200
         tweets = r.json()
@@ -161,18 +158,17 @@ class TestUserTweets:
 
     def test_get_user_tweets_newest_first(self, client: TestClient) -> None:
         """GET /users/{id}/tweets returns tweets sorted newest-first."""
-        user = _create_user(client, "judy", "Judy")
-        _create_tweet(client, user["id"], "Older tweet")
-        _create_tweet(client, user["id"], "Newer tweet")
+        user = post_user(client, "judy", "Judy")
+        make_tweets(user["id"], ["Older tweet", "Newer tweet"])
         r = client.get(f"/users/{user['id']}/tweets")
         tweets = r.json()
-        # Newest tweet should be first; created_at is ISO string — lexicographic sort works
+        # Newest first: the endpoint walks the author index backwards, no sort involved
         assert tweets[0]["content"] == "Newer tweet"
         assert tweets[1]["content"] == "Older tweet"
 
     def test_get_user_tweets_empty(self, client: TestClient) -> None:
         """GET /users/{id}/tweets returns empty list when user has no tweets."""
-        user = _create_user(client, "ken", "Ken")
+        user = post_user(client, "ken", "Ken")
         r = client.get(f"/users/{user['id']}/tweets")
         assert r.status_code == 200
         assert r.json() == []
@@ -181,3 +177,11 @@ class TestUserTweets:
         """GET /users/{id}/tweets returns 404 for a nonexistent user."""
         r = client.get("/users/ghost-user/tweets")
         assert r.status_code == 404
+
+    def test_get_user_tweets_excludes_deleted(self, client: TestClient) -> None:
+        """GET /users/{id}/tweets no longer lists a tweet after it is deleted."""
+        user = post_user(client, "liam", "Liam")
+        kept_id, gone_id = make_tweets(user["id"], ["Keep me", "Delete me"])
+        assert client.delete(f"/tweets/{gone_id}").status_code == 204
+        r = client.get(f"/users/{user['id']}/tweets")
+        assert [t["id"] for t in r.json()] == [kept_id]